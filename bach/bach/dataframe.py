@@ -169,7 +169,7 @@ class DataFrame:
             self,
             engine: Engine,
             base_node: BachSqlModel,
-            index: Dict[str, 'Series'],
+            index: Mapping[str, 'Series'],
             series: Dict[str, 'Series'],
             group_by: Optional['GroupBy'],
             order_by: List[SortColumn],
@@ -193,7 +193,7 @@ class DataFrame:
         """
         self._engine = engine
         self._base_node = base_node
-        self._index = copy(index)
+        self._index = dict(index)
         self._data: Dict[str, Series] = {}
         self._group_by = group_by
         self._order_by = order_by if order_by is not None else []
@@ -3412,7 +3412,7 @@ class DataFrame:
         return encoded_df
 
 
-def dict_name_series_equals(a: Dict[str, 'Series'], b: Dict[str, 'Series']):
+def dict_name_series_equals(a: Mapping[str, 'Series'], b: Mapping[str, 'Series']):
     """
     Compare two dicts in the format that we use to track series and indices.
     A normal == does not work on these dicts, because Series.equals() is overridden to create SeriesBoolean,
@@ -2,8 +2,12 @@
 Copyright 2021 Objectiv B.V.
 """
 import re
-from dataclasses import dataclass
-from typing import Optional, Union, TYPE_CHECKING, List, Dict, Tuple, Set, Sequence
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Union, TYPE_CHECKING, List, Dict, Tuple, Set, Sequence, Mapping, cast
+from weakref import WeakValueDictionary
 
 from sqlalchemy.engine import Dialect
 
@@ -15,15 +19,41 @@ if TYPE_CHECKING:
     from bach.sql_model import BachSqlModel
 
 
+# The sql of tokens only depends on the token's fields and the dialect. The same raw sql, identifiers and
+# column references occur over and over again when compiling expressions. So we cache their escaping and
+# quoting here. String values are not cached: those are user data, mostly unique and possibly large.
+
+@lru_cache(maxsize=4096)
+def _escaped_raw_sql(sql: str) -> str:
+    return escape_raw_sql(sql)
+
+
+@lru_cache(maxsize=4096)
+def _escaped_identifier(dialect: Dialect, name: str) -> str:
+    return escape_raw_sql(quote_identifier(dialect, name))
+
+
+@lru_cache(maxsize=4096)
+def _escaped_table_column_reference(dialect: Dialect, table_name: Optional[str], column_name: str) -> str:
+    t = f'{quote_identifier(dialect, table_name)}.' if table_name else ''
+    col_name = quote_identifier(dialect, column_name)
+    return escape_raw_sql(f'{t}{col_name}')
+
+
 @dataclass(frozen=True)
-class ExpressionToken:
-    """ Abstract base class of ExpressionTokens"""
+class ExpressionToken(ABC):
+    """
+    Abstract base class of ExpressionTokens
 
-    def __post_init__(self):
-        # Make sure that other code can rely on an ExpressionToken always being a subclass of this class.
-        if self.__class__ == ExpressionToken:
-            raise TypeError("Cannot instantiate ExpressionToken directly. Instantiate a subclass.")
+    Tokens are created in large numbers, so all subclasses define __slots__ to prevent the overhead of an
+    instance __dict__. As a frozen dataclass with slots cannot be unpickled or deepcopied by setting its
+    attributes, we implement __getstate__ and __setstate__ ourselves.
+    """
+    __slots__ = ()
 
+    # to_sql() is abstract, so ExpressionToken itself cannot be instantiated. That way other code can rely on
+    # an ExpressionToken always being a subclass of this class, without a check on every instantiation.
+    @abstractmethod
     def to_sql(self, dialect: Dialect):
         """
         Must be implemented by subclasses. Generated SQL must be assumed to be used as raw sql in
@@ -31,20 +61,49 @@ class ExpressionToken:
          * escape_format_string() twice, unless the value is a specific SqlModel placeholder or reference
          * other escaping/quoting as needed.
         """
-        # Not abstract so we can stay a dataclass.
         raise NotImplementedError()
 
+    def __getstate__(self):
+        return [getattr(self, field.name) for field in fields(self)]
+
+    def __setstate__(self, state):
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
+
 
 @dataclass(frozen=True)
 class RawToken(ExpressionToken):
+    __slots__ = ('raw', '__weakref__')
     raw: str
 
     def to_sql(self, dialect: Dialect) -> str:
-        return escape_raw_sql(self.raw)
+        return _escaped_raw_sql(self.raw)
+
+    @classmethod
+    def get(cls, raw: str) -> 'RawToken':
+        """
+        Get a RawToken for the raw sql. The same small set of raw sql strings (operators, parentheses,
+        commas, etc.) is used over and over again, so equal tokens are shared. This is safe as tokens are
+        immutable.
+        """
+        token = _RAW_TOKENS.get(raw)
+        if token is None:
+            token = cls(raw=raw)
+            _RAW_TOKENS[raw] = token
+        return token
+
+
+# Canonical RawToken instances, see RawToken.get()
+_RAW_TOKENS: 'WeakValueDictionary[str, RawToken]' = WeakValueDictionary()
+
+
+# Pattern of the placeholder names generated by VariableToken.dtype_name_to_placeholder_name()
+_PLACEHOLDER_NAME_PATTERN = re.compile('^___bach_variable___([a-zA-Z0-9)]+)___(.+)$')
 
 
 @dataclass(frozen=True)
 class VariableToken(ExpressionToken):
+    __slots__ = ('dtype', 'name')
     dtype: str
     name: str
 
@@ -66,7 +125,7 @@ class VariableToken(ExpressionToken):
         Reverse of dtype_name_to_placeholder_name().
         Will return None if the placeholder_name doesn't match the pattern
         """
-        match = re.match('^___bach_variable___([a-zA-Z0-9)]+)___(.+)$', placeholder_name)
+        match = _PLACEHOLDER_NAME_PATTERN.match(placeholder_name)
         if not match:
             return None
         return cls(match.group(1), match.group(2))
@@ -74,17 +133,17 @@ class VariableToken(ExpressionToken):
 
 @dataclass(frozen=True)
 class TableColumnReferenceToken(ExpressionToken):
+    __slots__ = ('table_name', 'column_name')
     table_name: Optional[str]
     column_name: str
 
     def to_sql(self, dialect: Dialect):
-        t = f'{quote_identifier(dialect, self.table_name)}.' if self.table_name else ''
-        col_name = quote_identifier(dialect, self.column_name)
-        return escape_raw_sql(f'{t}{col_name}')
+        return _escaped_table_column_reference(dialect, self.table_name, self.column_name)
 
 
 @dataclass(frozen=True)
 class ColumnReferenceToken(ExpressionToken):
+    __slots__ = ('column_name',)
     column_name: str
 
     def to_sql(self, dialect: Dialect):
@@ -92,11 +151,18 @@ class ColumnReferenceToken(ExpressionToken):
                          'Expression.resolve_column_references')
 
     def resolve(self, table_name: Optional[str]) -> TableColumnReferenceToken:
-        return TableColumnReferenceToken(table_name=table_name, column_name=self.column_name)
+        return _resolved_column_reference(table_name=table_name, column_name=self.column_name)
+
+
+@lru_cache(maxsize=4096)
+def _resolved_column_reference(table_name: Optional[str], column_name: str) -> TableColumnReferenceToken:
+    """ Shared TableColumnReferenceTokens, as the same columns get resolved for every compilation. """
+    return TableColumnReferenceToken(table_name=table_name, column_name=column_name)
 
 
 @dataclass(frozen=True)
 class ModelReferenceToken(ExpressionToken):
+    __slots__ = ('model',)
     model: 'BachSqlModel'
 
     def refname(self) -> str:
@@ -109,6 +175,7 @@ class ModelReferenceToken(ExpressionToken):
 @dataclass(frozen=True)
 class StringValueToken(ExpressionToken):
     """ Wraps a string value. The value in this object is unescaped and unquoted. """
+    __slots__ = ('value',)
     value: str
 
     def to_sql(self, dialect: Dialect) -> str:
@@ -117,10 +184,66 @@ class StringValueToken(ExpressionToken):
 
 @dataclass(frozen=True)
 class IdentifierToken(ExpressionToken):
+    __slots__ = ('name',)
     name: str
 
     def to_sql(self, dialect: Dialect) -> str:
-        return escape_raw_sql(quote_identifier(dialect, self.name))
+        return _escaped_identifier(dialect, self.name)
+
+
+# Tokens used to wrap NonAtomicExpressions in Expression.construct()
+_OPEN_PARENTHESIS_TOKEN = RawToken.get('(')
+_CLOSE_PARENTHESIS_TOKEN = RawToken.get(')')
+
+
+@lru_cache(maxsize=2048)
+def _parse_construct_fmt(fmt: str) -> Tuple[Tuple[Optional[RawToken], ...], int]:
+    """
+    Parse a format string as used by Expression.construct().
+    :return: tuple with two items:
+        1. tuple with a RawToken for each non-empty part of fmt between the `{}` occurrences, and None for
+            every `{}` occurrence.
+        2. number of `{}` occurrences in fmt.
+    """
+    sub_strs = fmt.split('{}')
+    template: List[Optional[RawToken]] = []
+    for i, sub_str in enumerate(sub_strs):
+        if i > 0:
+            template.append(None)
+        if sub_str != '':
+            template.append(RawToken.get(sub_str))
+    return tuple(template), len(sub_strs) - 1
+
+
+def _unwrap_plain_expression(expr: 'Expression') -> 'Expression':
+    """
+    Strip plain Expressions that do nothing but wrap a single other plain Expression, e.g.
+    Expression([Expression([RawToken('x')])]) becomes Expression([RawToken('x')]).
+
+    Only wrappers around plain Expressions are removed; the wrapper's flags and generated sql are identical
+    to those of its single sub-expression in that case. Expressions that contain more than one item are not
+    flattened, as the nesting determines which parts are constant or single-valued.
+    """
+    while type(expr) is Expression and len(expr._data) == 1:
+        sub_expr = expr._data[0]
+        if type(sub_expr) is not Expression:
+            break
+        expr = sub_expr
+    return expr
+
+
+# Bit flags describing properties of an Expression, including all its sub-expressions. See Expression._flags
+_FLAG_AGGREGATE_FUNCTION = 1 << 0
+_FLAG_WINDOW_FUNCTION = 1 << 1
+_FLAG_MULTI_LEVEL = 1 << 2
+_FLAG_COLUMN_REFERENCE = 1 << 3
+_FLAG_TABLE_COLUMN_REFERENCE = 1 << 4
+_FLAG_SINGLE_VALUE = 1 << 5
+_FLAG_CONSTANT = 1 << 6
+_FLAG_MODEL_REFERENCE = 1 << 7
+# Flags that are set if they are set on all sub-expressions (and there is at least one sub-expression),
+# all other flags are set if they are set on any sub-expression.
+_FLAGS_ALL_SUB_EXPRESSIONS = _FLAG_SINGLE_VALUE | _FLAG_CONSTANT
 
 
 class Expression:
@@ -139,27 +262,75 @@ class Expression:
 
     For special type Expressions, this class is subclassed to assign special properties to a subexpression.
     """
+    # Flags that are always set on instances of this class, and flags of sub-expressions that are hidden by
+    # instances of this class. Subclasses override these to assign their special properties.
+    _own_flags = 0
+    _hidden_flags = 0
+    _flags: int
+
+    # Expressions are created in large numbers, prevent the overhead of an instance __dict__
+    __slots__ = ('_data', '_flags', '_flat_tokens', '_resolved_cache', '_sql_cache', '_references', '_hash')
 
     def __init__(self, data: Union['Expression', Sequence[Union[ExpressionToken, 'Expression']]] = None):
         if not data:
             data = []
         if isinstance(data, Expression):
             # if we only got a base Expression, we absorb it.
-            data = data.data if type(data) is Expression else [data]
+            data = data._data if type(data) is Expression else [data]
         self._data: Tuple[Union[ExpressionToken, 'Expression'], ...] = tuple(data)
+        # Bitmask of _FLAG_* values. Computed from the direct children only, as sub-expressions already
+        # have their flags computed. This makes the is_* and has_* properties O(1).
+        any_flags = 0
+        all_flags = _FLAGS_ALL_SUB_EXPRESSIONS
+        has_sub_expressions = False
+        for item in self._data:
+            if isinstance(item, Expression):
+                any_flags |= item._flags
+                all_flags &= item._flags
+                has_sub_expressions = True
+            elif isinstance(item, ColumnReferenceToken):
+                any_flags |= _FLAG_COLUMN_REFERENCE
+            elif isinstance(item, TableColumnReferenceToken):
+                any_flags |= _FLAG_TABLE_COLUMN_REFERENCE
+            elif isinstance(item, ModelReferenceToken):
+                any_flags |= _FLAG_MODEL_REFERENCE
+        flags = any_flags & ~_FLAGS_ALL_SUB_EXPRESSIONS
+        if has_sub_expressions:
+            flags |= all_flags
+        self._flags = (flags & ~self._hidden_flags) | self._own_flags
+        # All tokens of this expression and its sub-expressions in order, built on first use.
+        self._flat_tokens: Optional[Tuple[ExpressionToken, ...]] = None
+        # Expressions are immutable, so the results of resolve_column_references() and to_sql() can be
+        # reused. The caches are only created on first use, as most Expressions never get compiled directly.
+        self._resolved_cache: Optional[Dict[Optional[str], 'Expression']] = None
+        self._sql_cache: Optional[Dict[Tuple[Dialect, Optional[str]], str]] = None
+        self._references: Optional[Mapping[str, 'BachSqlModel']] = None
+        # Hashing the data is O(n), and Expressions are used as dictionary keys a lot. Computed on first use.
+        self._hash: Optional[int] = None
 
     @property
     def data(self) -> List[Union[ExpressionToken, 'Expression']]:
+        """
+        Copy of the tokens and sub-expressions of this Expression. Internally we iterate over self._data
+        directly, to prevent copying on every access.
+        """
         return list(self._data)
 
     def __eq__(self, other):
-        return isinstance(other, Expression) and self.data == other.data
+        return isinstance(other, Expression) and self._data == other._data
 
     def __repr__(self):
         return f'{self.__class__}({repr(self.data)})'
 
     def __hash__(self):
-        return hash(self._data)
+        if self._hash is None:
+            self._hash = hash(self._data)
+        return self._hash
+
+    def __reduce__(self):
+        # Only pickle/copy the data: the caches are recomputed on demand, and string hashes (and thus
+        # self._hash) differ between Python processes.
+        return self.__class__, (self._data, )
 
     @classmethod
     def construct(cls, fmt: str, *args: Union['Expression', 'Series']) -> 'Expression':
@@ -176,27 +347,79 @@ class Expression:
             occurrences in fmt.
         """
 
-        sub_strs = fmt.split('{}')
-        data: List[Union[ExpressionToken, Expression]] = []
-        if len(args) != len(sub_strs) - 1:
+        template, arg_count = _parse_construct_fmt(fmt)
+        if len(args) != arg_count:
             raise ValueError(f'For each {{}} in the fmt there should be an Expression provided. '
-                             f'Found {{}}: {len(sub_strs) - 1}, provided expressions: {len(args)}')
-        for i, sub_str in enumerate(sub_strs):
-            if i > 0:
-                arg = args[i - 1]
-                if not isinstance(arg, Expression):  # arg is a Series
-                    arg_expr = arg.expression
-                else:
-                    arg_expr = arg
+                             f'Found {{}}: {arg_count}, provided expressions: {len(args)}')
+        data: List[Union[ExpressionToken, Expression]] = []
+        args_iter = iter(args)
+        for item in template:
+            if item is not None:
+                data.append(item)
+                continue
 
-                if isinstance(arg_expr, NonAtomicExpression):
-                    data.extend([RawToken('('), arg_expr, RawToken(')')])
-                else:
-                    data.append(arg_expr)
-            if sub_str != '':
-                data.append(RawToken(raw=sub_str))
+            arg = next(args_iter)
+            if not isinstance(arg, Expression):  # arg is a Series
+                arg_expr = arg.expression
+            else:
+                arg_expr = arg
+            arg_expr = _unwrap_plain_expression(arg_expr)
+
+            if isinstance(arg_expr, NonAtomicExpression):
+                data.extend([_OPEN_PARENTHESIS_TOKEN, arg_expr, _CLOSE_PARENTHESIS_TOKEN])
+            else:
+                data.append(arg_expr)
         return cls(data=data)
 
+    def get_construct_args(self, fmt: str) -> Optional[List['Expression']]:
+        """
+        Inverse of construct(): if this Expression has the same data as the Expression returned by
+        `construct(fmt, *args)` for some args, then return those args as Expressions. Otherwise return None.
+
+        The type of this Expression is not checked, callers that care about it should check it themselves.
+        :param fmt: format string, as given to construct()
+        """
+        template, _ = _parse_construct_fmt(fmt)
+        data = self._data
+        args: List[Expression] = []
+        pos = 0
+        for item in template:
+            if pos >= len(data):
+                return None
+            if item is not None:
+                if data[pos] != item:
+                    return None
+                pos += 1
+                continue
+
+            arg = data[pos]
+            if arg == _OPEN_PARENTHESIS_TOKEN:
+                # construct() adds parentheses around NonAtomicExpressions
+                if pos + 2 >= len(data) or not isinstance(data[pos + 1], NonAtomicExpression) \
+                        or data[pos + 2] != _CLOSE_PARENTHESIS_TOKEN:
+                    return None
+                args.append(cast(Expression, data[pos + 1]))
+                pos += 3
+            elif isinstance(arg, Expression) and not isinstance(arg, NonAtomicExpression):
+                args.append(arg)
+                pos += 1
+            else:
+                return None
+        if pos != len(data):
+            return None
+        return args
+
+    def get_joined_construct_args(self, separator: str) -> Optional[List['Expression']]:
+        """
+        Like get_construct_args(), for a format string that joins two or more `({})` with separator, e.g.
+        `({}) AND ({}) AND ({})` for separator ` AND `. The number of args is not known upfront.
+        """
+        separator_token = RawToken(raw=f'){separator}(')
+        separator_count = sum(1 for item in self._data if item == separator_token)
+        if separator_count == 0:
+            return None
+        return self.get_construct_args(separator.join(['({})'] * (separator_count + 1)))
+
     @classmethod
     def construct_expr_as_name(cls, expr: 'Expression', name: str) -> 'Expression':
         """
@@ -212,7 +435,7 @@ class Expression:
     @classmethod
     def raw(cls, raw: str) -> 'Expression':
         """ Return an expression that contains a single RawToken. """
-        return cls([RawToken(raw)])
+        return cls([RawToken.get(raw)])
 
     @classmethod
     def variable(cls, dtype: str, name: str) -> 'Expression':
@@ -248,7 +471,7 @@ class Expression:
         return cls([ModelReferenceToken(model)])
 
     @property
-    def is_single_value(self):
+    def is_single_value(self) -> bool:
         """
         Will this expression return just one value (at most)
 
@@ -257,13 +480,10 @@ class Expression:
         not single valued, so at least one SingleValueExpression need to be present for a branch to
         become single valued.
         """
-        if isinstance(self, SingleValueExpression):
-            return True
-        all_single_value = [d.is_single_value for d in self._data if isinstance(d, Expression)]
-        return len(all_single_value) and all(all_single_value)
+        return bool(self._flags & _FLAG_SINGLE_VALUE)
 
     @property
-    def is_constant(self):
+    def is_constant(self) -> bool:
         """
         Does this expression represent a constant value, or an expressions constructed of only constants
 
@@ -271,10 +491,7 @@ class Expression:
         is considered constant. Leaves consisting only of Tokens are considered not constant, so
         at least one ConstValueExpressions need to be present for a branch to become constant.
         """
-        if isinstance(self, ConstValueExpression):
-            return True
-        all_constant = [d.is_constant for d in self._data if isinstance(d, Expression)]
-        return len(all_constant) and all(all_constant)
+        return bool(self._flags & _FLAG_CONSTANT)
 
     @property
     def is_independent_subquery(self):
@@ -285,45 +502,49 @@ class Expression:
         """
         True iff we are a AggregateFunctionExpression, or there is at least one in this Expression.
         """
-        return isinstance(self, AggregateFunctionExpression) or any(
-            d.has_aggregate_function for d in self.data if isinstance(d, Expression)
-        )
+        return bool(self._flags & _FLAG_AGGREGATE_FUNCTION)
 
     @property
     def has_windowed_aggregate_function(self) -> bool:
         """
         True iff we are a WindowFunctionExpression, or there is at least one in this Expression.
         """
-        return isinstance(self, WindowFunctionExpression) or any(
-            d.has_windowed_aggregate_function for d in self.data if isinstance(d, Expression)
-        )
+        return bool(self._flags & _FLAG_WINDOW_FUNCTION)
 
     @property
     def has_table_column_references(self) -> bool:
         """
         True iff we are a TableColumnReference, or there is at least one in this Expression.
         """
-        return any(
-            isinstance(token, TableColumnReferenceToken) for token in self.get_all_tokens()
-        )
+        return bool(self._flags & _FLAG_TABLE_COLUMN_REFERENCE)
 
     @property
     def has_multi_level_expressions(self) -> bool:
-        return isinstance(self, MultiLevelExpression) or any(
-            d.has_multi_level_expressions for d in self.data if isinstance(d, Expression)
-        )
+        return bool(self._flags & _FLAG_MULTI_LEVEL)
 
     def resolve_column_references(self, dialect: Dialect, table_name: Optional[str]) -> 'Expression':
         """ resolve the table name aliases for all columns in this expression """
+        if self._resolved_cache is None:
+            self._resolved_cache = {}
+        elif table_name in self._resolved_cache:
+            return self._resolved_cache[table_name]
+
+        if not self._flags & _FLAG_COLUMN_REFERENCE:
+            # nothing to resolve, as we are immutable we can just return ourselves
+            self._resolved_cache[table_name] = self
+            return self
+
         result: List[Union[ExpressionToken, Expression]] = []
-        for data_item in self.data:
+        for data_item in self._data:
             if isinstance(data_item, Expression):
                 result.append(data_item.resolve_column_references(dialect, table_name))
             elif isinstance(data_item, ColumnReferenceToken):
                 result.append(data_item.resolve(table_name))
             else:
                 result.append(data_item)
-        return self.__class__(result)
+        resolved = self.__class__(result)
+        self._resolved_cache[table_name] = resolved
+        return resolved
 
     def replace_column_references(self, old_column_name: str, new_column_name: str) -> 'Expression':
         """
@@ -358,27 +579,56 @@ class Expression:
 
             table_name = token.table_name if token.table_name and not table_name else table_name
             column_name = column_name or token.column_name
-            new_tokens.extend(Expression.column_reference(token.column_name).data)
+            new_tokens.append(ColumnReferenceToken(token.column_name))
 
         return table_name, column_name, Expression(new_tokens)
 
-    def get_references(self) -> Dict[str, 'BachSqlModel']:
-        rv = {}
-        for data_item in self.data:
+    def get_references(self) -> Mapping[str, 'BachSqlModel']:
+        """
+        Get all models referenced by ModelReferenceTokens in this expression and its sub-expressions.
+        The result is cached, and combined from the cached results of the sub-expressions. It is returned as
+        a read-only mapping, as it is shared.
+        """
+        if self._references is not None:
+            return self._references
+        if not self._flags & _FLAG_MODEL_REFERENCE:
+            self._references = _NO_REFERENCES
+            return self._references
+        rv: Dict[str, 'BachSqlModel'] = {}
+        for data_item in self._data:
             if isinstance(data_item, Expression):
                 rv.update(data_item.get_references())
             elif isinstance(data_item, ModelReferenceToken):
                 rv[data_item.refname()] = data_item.model
-        return rv
+        self._references = MappingProxyType(rv)
+        return self._references
 
     def get_all_tokens(self) -> List[ExpressionToken]:
-        result = []
-        for data_item in self.data:
-            if isinstance(data_item, Expression):
-                result.extend(data_item.get_all_tokens())
+        return list(self._get_flat_tokens())
+
+    def _get_flat_tokens(self) -> Tuple[ExpressionToken, ...]:
+        """
+        Get all tokens of this expression and its sub-expressions in order. The result is computed without
+        recursion on first use, and cached as we are immutable.
+        """
+        if self._flat_tokens is not None:
+            return self._flat_tokens
+        tokens: List[ExpressionToken] = []
+        stack = [iter(self._data)]
+        while stack:
+            for data_item in stack[-1]:
+                if not isinstance(data_item, Expression):
+                    tokens.append(data_item)
+                elif data_item._flat_tokens is not None:
+                    tokens.extend(data_item._flat_tokens)
+                else:
+                    # descend into the sub-expression, continue with the rest of this level afterwards
+                    stack.append(iter(data_item._data))
+                    break
             else:
-                result.append(data_item)
-        return result
+                stack.pop()
+        self._flat_tokens = tuple(tokens)
+        return self._flat_tokens
 
     def to_sql(self, dialect: Dialect, table_name: Optional[str] = None) -> str:
         """
@@ -387,10 +637,39 @@ class Expression:
             '"{table_name}"."{column_name}"' instead of just '"{column_name}"'.
         :return SQL representation of the expression.
         """
-        resolved_tables_expression = self.resolve_column_references(dialect, table_name)
-        return ''.join(
-            d.to_sql(dialect=dialect) for d in resolved_tables_expression.data
-        )
+        key = (dialect, table_name)
+        if self._sql_cache is None:
+            self._sql_cache = {}
+        elif key in self._sql_cache:
+            return self._sql_cache[key]
+        sql = self._compile_sql(dialect, table_name)
+        self._sql_cache[key] = sql
+        return sql
+
+    def _compile_sql(self, dialect: Dialect, table_name: Optional[str]) -> str:
+        """ Uncached implementation of to_sql(). """
+        if self._flags & _FLAG_MULTI_LEVEL:
+            # MultiLevelExpressions join their sub-expressions differently, so we cannot just join all tokens
+            return ''.join(self._compile_sql_parts(dialect, table_name))
+        # Column references are compiled directly, rather than first creating a resolved copy of ourselves.
+        return ''.join([
+            _escaped_table_column_reference(dialect, table_name, token.column_name)
+            if isinstance(token, ColumnReferenceToken) else token.to_sql(dialect=dialect)
+            for token in self._get_flat_tokens()
+        ])
+
+    def _compile_sql_parts(self, dialect: Dialect, table_name: Optional[str]) -> List[str]:
+        """ Compile each of the direct tokens and sub-expressions of this expression separately. """
+        return [
+            d.resolve(table_name).to_sql(dialect=dialect) if isinstance(d, ColumnReferenceToken)
+            else d.to_sql(dialect, table_name) if isinstance(d, Expression)
+            else d.to_sql(dialect=dialect)
+            for d in self._data
+        ]
+
+
+# Result of Expression.get_references() for all Expressions without model references
+_NO_REFERENCES: Mapping[str, 'BachSqlModel'] = MappingProxyType({})
 
 
 class NonAtomicExpression(Expression):
@@ -400,11 +679,11 @@ class NonAtomicExpression(Expression):
     in parenthesis, e.g. `expression` `<` `ANY (subquery)` should probably have `expression` wrapped if it's
     a complex expression, but not the `ANY ...` part, since that would not be valid SQL.
     """
-    pass
+    __slots__ = ()
 
 
 class IndependentSubqueryExpression(Expression):
-    pass
+    __slots__ = ()
 
 
 class SingleValueExpression(Expression):
@@ -412,6 +691,9 @@ class SingleValueExpression(Expression):
     An Expression that is expected to return just one value.
     If wrapped around IndependentSubqueryExpression, this will still have is_independent_subquery == True
     """
+    __slots__ = ()
+    _own_flags = _FLAG_SINGLE_VALUE
+
     @property
     def is_independent_subquery(self) -> bool:
         # If this Expression is wrapped around a IndependentSubqueryExpression, most likely, there will be
@@ -421,16 +703,17 @@ class SingleValueExpression(Expression):
 
 
 class ConstValueExpression(SingleValueExpression):
-    pass
+    __slots__ = ()
+    _own_flags = _FLAG_SINGLE_VALUE | _FLAG_CONSTANT
 
 
 class AggregateFunctionExpression(Expression):
-    @property
-    def is_constant(self) -> bool:
-        # We don't consider an aggregate function constant even if all its subexpressions are,
-        # because it requires materialization of the aggregation to actually be a constant value again.
-        # Maybe we will revisit this some day. If that day comes, make sure to look at Series.count() as well.
-        return False
+    __slots__ = ()
+    _own_flags = _FLAG_AGGREGATE_FUNCTION
+    # We don't consider an aggregate function constant even if all its subexpressions are,
+    # because it requires materialization of the aggregation to actually be a constant value again.
+    # Maybe we will revisit this some day. If that day comes, make sure to look at Series.count() as well.
+    _hidden_flags = _FLAG_CONSTANT
 
 
 class WindowFunctionExpression(Expression):
@@ -441,30 +724,26 @@ class WindowFunctionExpression(Expression):
     is contained within the expression.
 
     """
-    @property
-    def is_constant(self) -> bool:
-        # We don't consider an window expression constant even if all its subexpressions are,
-        # because it requires materialization to actually be a constant value again.
-        # Maybe we will revisit this some day. If that day comes, make sure to look at Series.count() as well.
-        return False
-
-    @property
-    def has_aggregate_function(self) -> bool:
-        # If a window expression contains an aggregate function, it's not an aggregate expression
-        return False
+    __slots__ = ()
+    _own_flags = _FLAG_WINDOW_FUNCTION
+    # If a window expression contains an aggregate function, it's not an aggregate expression.
+    # We don't consider an window expression constant even if all its subexpressions are,
+    # because it requires materialization to actually be a constant value again.
+    # Maybe we will revisit this some day. If that day comes, make sure to look at Series.count() as well.
+    _hidden_flags = _FLAG_AGGREGATE_FUNCTION | _FLAG_CONSTANT
 
 
 class MultiLevelExpression(Expression):
     """
     A MultiLevelExpression contains multiple expressions referencing to different columns.
     """
-    def to_sql(self, dialect: Dialect, table_name: Optional[str] = None) -> str:
+    __slots__ = ()
+    _own_flags = _FLAG_MULTI_LEVEL
+
+    def _compile_sql(self, dialect: Dialect, table_name: Optional[str]) -> str:
         # same as original function, we just need to join by a comma since parent expression is composed
         # by multiple column references
-        resolved_tables_expression = self.resolve_column_references(dialect, table_name)
-        return ','.join(
-            d.to_sql(dialect=dialect) for d in resolved_tables_expression.data
-        )
+        return ','.join(self._compile_sql_parts(dialect, table_name))
 
 
 def join_expressions(expressions: Sequence[Expression], join_str: str = ', ') -> Expression:
@@ -407,6 +407,11 @@ class Window(GroupBy):
                                 f' AND {end_boundary.frame_clause(end_value)}'
 
         self._order_by = order_by
+        # The `over (...)` part of the window expression. As windows are immutable, this is built only
+        # once, and shared by all window functions that use this window. Created on first use.
+        self._over_expression: Optional[Expression] = None
+        # This window without frame clause, see without_frame_clause(). Created on first use.
+        self._without_frame_clause: Optional['Window'] = None
 
     @property
     def frame_clause(self) -> str:
@@ -438,6 +443,19 @@ class Window(GroupBy):
                       start_boundary=start_boundary, start_value=start_value,
                       end_boundary=end_boundary, end_value=end_value)
 
+    def without_frame_clause(self) -> 'Window':
+        """
+        Return this window without its frame clause. Equivalent to
+        `set_frame_clause(start_boundary=None, end_boundary=None)`, but the clone is only created once, and
+        not at all if this window doesn't have a frame clause already.
+        """
+        if self._without_frame_clause is None:
+            if not self._frame_clause and self._min_values == 0:
+                self._without_frame_clause = self
+            else:
+                self._without_frame_clause = self.set_frame_clause(start_boundary=None, end_boundary=None)
+        return self._without_frame_clause
+
     def _get_order_by_expression(self) -> Expression:
         """
         Get a properly formatted order by clause based on this df's order_by.
@@ -450,11 +468,13 @@ class Window(GroupBy):
         else:
             return Expression.construct('')
 
-    def get_window_expression(self, window_func: Expression) -> Expression:
+    def _get_over_expression(self) -> Expression:
         """
-        Given the window_func generate a statement like:
-            {window_func} OVER (PARTITION BY .. ORDER BY ... frame_clause)
+        Get the `OVER (PARTITION BY .. ORDER BY ... frame_clause)` part of the window expression.
         """
+        if self._over_expression is not None:
+            return self._over_expression
+
         # TODO implement NULLS FIRST / NULLS LAST, probably not here but in the sorting logic.
         order_by = self._get_order_by_expression()
 
@@ -472,7 +492,15 @@ class Window(GroupBy):
             partition_fmt = 'partition by ' + ', '.join(fmt_stmts)
 
         over_fmt = f'over ({partition_fmt} {{}} {frame_clause})'
-        over_expr = Expression.construct(over_fmt, *index_exprs, order_by)
+        self._over_expression = Expression.construct(over_fmt, *index_exprs, order_by)
+        return self._over_expression
+
+    def get_window_expression(self, window_func: Expression) -> Expression:
+        """
+        Given the window_func generate a statement like:
+            {window_func} OVER (PARTITION BY .. ORDER BY ... frame_clause)
+        """
+        over_expr = self._get_over_expression()
 
         if self._min_values is None or self._min_values == 0:
             return WindowFunctionExpression.construct(f'{{}} {{}}', window_func, over_expr)
@@ -2,15 +2,20 @@
 Copyright 2021 Objectiv B.V.
 """
 import re
-from typing import NamedTuple, Dict, List, Union, cast
+from typing import NamedTuple, Dict, List, Union, cast, Optional
 
 from sqlalchemy.engine import Engine, Dialect
 
 from bach import DataFrame
 from bach.sql_model import BachSqlModel
+from sql_models.graph_operations import get_node, replace_non_start_node_in_graph
 from sql_models.model import Materialization, SqlModel, CustomSqlModelBuilder
 from sql_models.sql_generator import to_sql_materialized_nodes
-from sql_models.util import quote_identifier
+from sql_models.util import quote_identifier, is_postgres
+
+
+# Pattern that savepoint names must match
+_SAVEPOINT_NAME_PATTERN = re.compile('^[a-zA-Z0-9_]+$')
 
 
 class SavepointEntry(NamedTuple):
@@ -45,6 +50,14 @@ class Savepoints:
 
     def __init__(self):
         self._entries: Dict[str, SavepointEntry] = {}
+        # Caches for _get_combined_graph() and to_sql(), generating those is expensive.
+        # Must be cleared with _clear_caches() whenever self._entries changes.
+        self._graph_cache: Optional[SqlModel] = None
+        self._sql_cache: Dict[Dialect, Dict[str, str]] = {}
+
+    def _clear_caches(self):
+        self._graph_cache = None
+        self._sql_cache = {}
 
     @property
     def all(self) -> List[SavepointEntry]:
@@ -62,8 +75,7 @@ class Savepoints:
         for name, entry in other._entries.items():
             if name in self._entries:
                 existing = self._entries[name]
-                if existing.df_original != entry.df_original \
-                        or existing.materialization != entry.materialization:
+                if _is_different_entry(existing, entry.df_original, entry.materialization):
                     raise ValueError(f'Conflicting savepoints. The savepoint "{name}" exists in both '
                                      f'Savepoints objects, but is different.')
             else:
@@ -72,6 +84,7 @@ class Savepoints:
                     df_original=entry.df_original.copy(),
                     materialization=entry.materialization,
                 )
+                self._clear_caches()
 
     def add_savepoint(self, name: str, df: DataFrame, materialization: Materialization):
         """
@@ -79,11 +92,11 @@ class Savepoints:
 
         Generally one would use :py:meth:`bach.DataFrame.set_savepoint()`
         """
-        if name is None or not re.match('^[a-zA-Z0-9_]+$', name):
-            raise ValueError(f'Name must match ^[a-zA-Z0-9_]+$, name: "{name}"')
+        if name is None or not _SAVEPOINT_NAME_PATTERN.match(name):
+            raise ValueError(f'Name must match {_SAVEPOINT_NAME_PATTERN.pattern}, name: "{name}"')
         if name in self._entries:
             existing = self._entries[name]
-            if existing.df_original != df or existing.materialization != materialization:
+            if _is_different_entry(existing, df, materialization):
                 raise ValueError(f'A different savepoint with the name "{name}" already exists.')
             # Nothing to do, we already have this entry
             return
@@ -101,6 +114,7 @@ class Savepoints:
             df_original=df.copy(),
             materialization=materialization
         )
+        self._clear_caches()
 
     def set_materialization(self, name: str, materialization: Union[Materialization, str]):
         """
@@ -123,6 +137,7 @@ class Savepoints:
             df_original=current.df_original,
             materialization=materialization
         )
+        self._clear_caches()
 
     def remove_savepoint(self, name: str):
         """
@@ -130,6 +145,7 @@ class Savepoints:
         NOTE: This does not undo any side-effects from earlier called function, such as :meth:`write_to_db()`
         """
         del self._entries[name]
+        self._clear_caches()
 
     def get_df(self, savepoint_name: str) -> 'DataFrame':
         """
@@ -177,26 +193,33 @@ class Savepoints:
                 raise ValueError("engine_override cannot be None if the savepoints's entries don't all "
                                  "share the same engine.")
             engine = list(engines)[0]
-        result_created = []
-        drop_statements = self.get_drop_statements(dialect=engine.dialect)
+        # Dropping is a bit fragile. Drop statements might fail if other objects (which we might not
+        # consider) depend on a view/table, or if the object type (view/table) is different than we assume.
+        # For now that's just the way it is, the user will get an error.
+        drop_statements = self.get_drop_statements(dialect=engine.dialect) if overwrite else {}
         create_statements = self.get_create_statements(dialect=engine.dialect)
 
+        # Executing all statements in one go prevents a round trip to the database per statement. We only
+        # do that on Postgres, where DDL is transactional: if the batch fails, it is rolled back as a whole.
+        # Other databases (e.g. BigQuery) might already have created some objects when a batch fails. There
+        # we execute one statement at a time, so that the raised error is for the failing savepoint.
+        batch = is_postgres(engine.dialect)
         with engine.connect() as conn:
             with conn.begin() as transaction:
-                if overwrite:
-                    # This is a bit fragile. Drop statements might fail if other objects (which we might not
-                    # consider) depend on a view/table, or if the object type (view/table) is different than
-                    # we assume. For now that's just the way it is, the user will get an error.
-                    if drop_statements:
-                        drop_sql = '; '.join(drop_statements.values())
-                        conn.execute(drop_sql)
-
-                for name, statement in create_statements.items():
-                    info = self._entries[name]
-                    conn.execute(statement)
-                    result_created.append(CreatedObject(name=name, materialization=info.materialization))
+                for statements in (drop_statements, create_statements):
+                    if not statements:
+                        continue
+                    if batch:
+                        conn.execute('; '.join(statements.values()))
+                    else:
+                        for statement in statements.values():
+                            conn.execute(statement)
                 transaction.commit()
-        return result_created
+
+        return [
+            CreatedObject(name=name, materialization=self._entries[name].materialization)
+            for name in create_statements.keys()
+        ]
 
     def get_drop_statements(self, dialect: Dialect) -> Dict[str, str]:
         """
@@ -235,9 +258,13 @@ class Savepoints:
         :param dialect: SQL Dialect
         :return: dictionary mapping the name of each savepoint to the sql for that savepoint.
         """
-        graph = self._get_combined_graph()
-        sqls = to_sql_materialized_nodes(dialect=dialect, start_node=graph, include_start_node=False)
-        return sqls
+        if dialect not in self._sql_cache:
+            graph = self._get_combined_graph()
+            self._sql_cache[dialect] = to_sql_materialized_nodes(
+                dialect=dialect, start_node=graph, include_start_node=False
+            )
+        # return a copy, so callers cannot modify our cache
+        return dict(self._sql_cache[dialect])
 
     def _get_combined_graph(self) -> SqlModel:
         """
@@ -245,6 +272,8 @@ class Savepoints:
 
         The savepoints are referred by the returned sql-model as 'ref_{name}'.
         """
+        if self._graph_cache is not None:
+            return self._graph_cache
         entries = list(self._entries.values())
         references: Dict[str, BachSqlModel] = {
             f'ref_{entry.name}': entry.df_original.base_node for entry in entries
@@ -252,37 +281,54 @@ class Savepoints:
         # Create one graph with all entries
         graph = _get_virtual_node(references)
 
-        # Now update all the nodes that represent an entry, to have the correct materialization
+        # Now update all the nodes that represent an entry, to have the correct materialization.
+        # Both materialization fields are updated at once, so the graph is only copied once per entry.
         for entry in entries:
             reference_path = (f'ref_{entry.name}', )
-            graph = graph.set_materialization_name(reference_path, materialization_name=entry.name)
-            graph = graph.set_materialization(reference_path, materialization=entry.materialization)
+            node = get_node(graph, reference_path)
+            if node.materialization_name == entry.name and node.materialization == entry.materialization:
+                continue
+            replacement_node = node.copy_override(
+                materialization=entry.materialization,
+                materialization_name=entry.name
+            )
+            graph = replace_non_start_node_in_graph(graph, reference_path, replacement_node)
+        self._graph_cache = graph
         return graph
 
     def __str__(self) -> str:
         """ Give string with overview of all savepoints per materialization. """
-        tables = [entry for entry in self.all if entry.materialization == Materialization.TABLE]
-        views = [entry for entry in self.all if entry.materialization == Materialization.VIEW]
-        others = [entry for entry in self.all if entry.materialization
-                  not in (Materialization.TABLE, Materialization.VIEW)]
-        result = [f'Savepoint, entries: {len(self.all)}']
-
-        result.append(f'\tTables, entries: {len(tables)}')
-        for table in tables:
-            result.append(f'\t\t{table.name}')
-
-        result.append(f'\tViews, entries: {len(views)}')
-        for view in views:
-            result.append(f'\t\t{view.name}')
+        entries = list(self._entries.values())
+        tables: List[SavepointEntry] = []
+        views: List[SavepointEntry] = []
+        others: List[SavepointEntry] = []
+        for entry in entries:
+            if entry.materialization == Materialization.TABLE:
+                tables.append(entry)
+            elif entry.materialization == Materialization.VIEW:
+                views.append(entry)
+            else:
+                others.append(entry)
 
-        result.append(f'\tOther, entries: {len(others)}')
-        for other in others:
-            result.append(f'\t\t{other.name}')
+        result = [f'Savepoint, entries: {len(entries)}']
+        for header, group in (('Tables', tables), ('Views', views), ('Other', others)):
+            result.append(f'\t{header}, entries: {len(group)}')
+            result.extend(f'\t\t{entry.name}' for entry in group)
 
         string = '\n'.join(result)
         return string
 
 
+def _is_different_entry(entry: SavepointEntry, df: DataFrame, materialization: Materialization) -> bool:
+    """
+    Check whether the entry has a different DataFrame or materialization than given. The materialization is
+    compared first, so the expensive DataFrame comparison is only done if needed.
+    """
+    if entry.materialization != materialization:
+        return True
+    return entry.df_original != df
+
+
 def _get_virtual_node(references: Dict[str, BachSqlModel]) -> SqlModel:
     # TODO: move this to sqlmodel?
     # reference_sql is of form "{{ref_0}}, {{1}}, ..., {{n}}"
@@ -1,8 +1,11 @@
 """
 Copyright 2021 Objectiv B.V.
 """
+import inspect
 from abc import ABC, abstractmethod
 from copy import copy, deepcopy
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, Dict, Tuple, Union, Type, Any, List, cast, TYPE_CHECKING, Callable, Mapping, \
     TypeVar, Sequence, NamedTuple
 from uuid import UUID
@@ -34,6 +37,27 @@ T = TypeVar('T', bound='Series')
 WrappedPartition = Union['GroupBy', 'DataFrame']
 WrappedWindow = Union['Window', 'DataFrame']
 
+# Expressions are immutable, so the literal for None and the expressions of window functions without
+# arguments can be shared.
+_NULL_EXPRESSION = Expression.raw('NULL')
+_ROW_NUMBER_EXPRESSION = Expression.construct('row_number()')
+_RANK_EXPRESSION = Expression.construct('rank()')
+_DENSE_RANK_EXPRESSION = Expression.construct('dense_rank()')
+_PERCENT_RANK_EXPRESSION = Expression.construct('percent_rank()')
+_CUME_DIST_EXPRESSION = Expression.construct('cume_dist()')
+
+
+@lru_cache(maxsize=None)
+def _cast_fmt(db_dtype: Optional[str]) -> str:
+    """ Format string that casts an expression to db_dtype, e.g. `'cast({} as bigint)'`. """
+    return f'cast({{}} as {db_dtype})'
+
+
+@lru_cache(maxsize=None)
+def _comparator_fmt(comparator: str) -> str:
+    """ Format string that compares two expressions, e.g. `'{} < {}'`. There are only a few comparators. """
+    return f'{{}} {comparator} {{}}'
+
 
 class ToPandasInfo(NamedTuple):
     """
@@ -69,8 +93,8 @@ class Series(ABC):
     #
     # * Mostly immutable *
     # The attributes of this class are either immutable, or this class is guaranteed not
-    # to modify them and the property accessors always return a copy. One exception tho: `engine` is mutable
-    # and is shared with other Series and DataFrames that can change it's state.
+    # to modify them and the property accessors return a copy or a read-only view (`index`). One exception
+    # tho: `engine` is mutable and is shared with other Series and DataFrames that can change it's state.
 
     dtype: str = ''
     """
@@ -118,7 +142,7 @@ class Series(ABC):
         self,
         engine: Engine,
         base_node: BachSqlModel,
-        index: Dict[str, 'Series'],
+        index: Mapping[str, 'Series'],
         name: str,
         expression: Expression,
         group_by: Optional['GroupBy'],
@@ -160,24 +184,10 @@ class Series(ABC):
             same value as self.dtype. For structured types (e.g. SeriesDict) this should indicate what the
             structure of the data is.
         """
-        # Series is an abstract class, besides the abstractmethods subclasses must/may override some
-        #   properties:
-        #   * non-abstract subclasses MUST override some class properties: 'dtype', and 'supported_db_dtype'
-        #   * subclasses MAY also override class properties: 'dtype_aliases', and 'supported_value_types'
-        # Unfortunately defining these properties as an "abstract-classmethod-property" makes it hard
-        # to understand for mypy, sphinx, and python. Therefore, we check here that we are instantiating a
-        # proper subclass, instead of just relying on @abstractmethod.
-        # related links:
-        # https://github.com/python/mypy/issues/8532#issuecomment-600132991
-        # https://github.com/python/mypy/issues/11619 https://bugs.python.org/issue45356
+        # The class properties that non-abstract subclasses must override are checked once per class in
+        # __init_subclass__(), instead of on every instantiation.
         if self.__class__ == Series:
             raise TypeError("Cannot instantiate Series directly. Instantiate a subclass.")
-        if self.dtype == '':
-            raise NotImplementedError("Non-abstract Series subclasses must override `dtype` class property")
-        if self.supported_db_dtype == {}:
-            raise NotImplementedError(
-                "Non-abstract Series subclasses must override `supported_db_dtype` class property")
-        # End of Abstract-class check
 
         self.assert_engine_dialect_supported(engine)
         if index == {} and group_by and group_by.index != {}:
@@ -198,13 +208,38 @@ class Series(ABC):
 
         self._engine = engine
         self._base_node = base_node
-        self._index = copy(index)
+        # The index is never modified, the index property returns a read-only view of it.
+        self._index: Dict[str, 'Series'] = dict(index)
         self._name = name
         self._expression = expression
         self._group_by = group_by
         self._sorted_ascending = sorted_ascending
         self._index_sorting = index_sorting
         self._instance_dtype = instance_dtype
+        # Results of get_column_expression() per table_alias. Only created on first use.
+        self._column_expressions: Optional[Dict[Optional[str], Expression]] = None
+        # Sort order of the DataFrame created by to_frame(). Only created on first use.
+        self._frame_order_by: Optional[List[SortColumn]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        # Series is an abstract class, besides the abstractmethods subclasses must/may override some
+        #   properties:
+        #   * non-abstract subclasses MUST override some class properties: 'dtype', and 'supported_db_dtype'
+        #   * subclasses MAY also override class properties: 'dtype_aliases', and 'supported_value_types'
+        # Unfortunately defining these properties as an "abstract-classmethod-property" makes it hard
+        # to understand for mypy, sphinx, and python. Therefore, we check here that a non-abstract subclass
+        # is a proper subclass, instead of just relying on @abstractmethod.
+        # related links:
+        # https://github.com/python/mypy/issues/8532#issuecomment-600132991
+        # https://github.com/python/mypy/issues/11619 https://bugs.python.org/issue45356
+        super().__init_subclass__(**kwargs)
+        if inspect.isabstract(cls):
+            return
+        if cls.dtype == '':
+            raise NotImplementedError("Non-abstract Series subclasses must override `dtype` class property")
+        if cls.supported_db_dtype == {}:
+            raise NotImplementedError(
+                "Non-abstract Series subclasses must override `supported_db_dtype` class property")
 
     @classmethod
     @abstractmethod
@@ -281,11 +316,11 @@ class Series(ABC):
         return self._base_node
 
     @property
-    def index(self) -> Dict[str, 'Series']:
+    def index(self) -> Mapping[str, 'Series']:
         """
         Get this Series' index dictionary {name: Series}
         """
-        return copy(self._index)
+        return MappingProxyType(self._index)
 
     @property
     def name(self) -> str:
@@ -299,7 +334,7 @@ class Series(ABC):
         """
         Get this Series' group_by, if any.
         """
-        return copy(self._group_by)
+        return self._group_by
 
     @property
     def sorted_ascending(self) -> Optional[bool]:
@@ -334,7 +369,7 @@ class Series(ABC):
         cls,
         engine: Engine,
         base_node: BachSqlModel,
-        index: Dict[str, 'Series'],
+        index: Mapping[str, 'Series'],
         name: str,
         expression: Expression,
         group_by: Optional['GroupBy'],
@@ -374,6 +409,11 @@ class Series(ABC):
             raise DatabaseNotSupportedException(dialect, message_override=message_override)
         return cls.supported_db_dtype[db_dialect]
 
+    @classmethod
+    def _cast_to_db_dtype(cls, dialect: Dialect, expression: Expression) -> Expression:
+        """ Return an Expression that casts the given expression to the static db_dtype of this Series. """
+        return Expression.construct(_cast_fmt(cls.get_db_dtype(dialect)), expression)
+
     @classmethod
     def value_to_literal(
             cls,
@@ -394,7 +434,7 @@ class Series(ABC):
         3. if dtype is a simple dtype and does not match cls.dtype, raises an error.
         """
         if value is None:
-            return Expression.raw('NULL')
+            return _NULL_EXPRESSION
         if not isinstance(value, cls.supported_value_types):
             raise TypeError(f'value should be one of {cls.supported_value_types}'
                             f', actual type: {type(value)}')
@@ -495,7 +535,7 @@ class Series(ABC):
         *,
         engine: Optional[Engine] = None,
         base_node: Optional[BachSqlModel] = None,
-        index: Optional[Dict[str, 'Series']] = None,
+        index: Optional[Mapping[str, 'Series']] = None,
         name: Optional[str] = None,
         expression: Optional['Expression'] = None,
         group_by: Optional[Union['GroupBy', NotSet]] = not_set,
@@ -530,24 +570,32 @@ class Series(ABC):
         self,
         dtype: Optional[str],
         *,
-        instance_dtype: Optional[StructuredDtype] = None
+        instance_dtype: Optional[StructuredDtype] = None,
+        expression: Optional[Expression] = None
     ) -> 'Series':
         """
         INTERNAL: create an instance of the Series subtype with the given dtype, and copy
         all values from self into that instance.
+
+        Optionally the expression of the new instance can be overridden too, which saves creating an
+        intermediate Series compared to calling copy_override(expression=...) on the result.
         """
         klass: Type['Series'] = get_series_type_from_dtype(self.dtype if dtype is None else dtype)
-        return self.copy_override_type(klass, instance_dtype=instance_dtype)
+        return self.copy_override_type(klass, instance_dtype=instance_dtype, expression=expression)
 
     def copy_override_type(
         self,
         series_type: Type[T],
         *,
         instance_dtype: Optional[StructuredDtype] = None,
+        expression: Optional[Expression] = None,
         **kwargs
     ) -> T:
         """
         INTERNAL: create an instance of the given Series subtype, copy all values from self.
+
+        Optionally the expression of the new instance can be overridden too, which saves creating an
+        intermediate Series compared to calling copy_override(expression=...) on the result.
         """
         instance_dtype = series_type.dtype if instance_dtype is None else instance_dtype
         return series_type(
@@ -555,7 +603,7 @@ class Series(ABC):
             base_node=self._base_node,
             index=self._index,
             name=self._name,
-            expression=self._expression,
+            expression=self._expression if expression is None else expression,
             group_by=self._group_by,
             sorted_ascending=self._sorted_ascending,
             index_sorting=self._index_sorting,
@@ -607,8 +655,15 @@ class Series(ABC):
 
     def get_column_expression(self, table_alias: str = None) -> Expression:
         """ INTERNAL: Get the column expression for this Series """
+        # Expression and name never change, so we only construct the column expression once per table_alias
+        if self._column_expressions is None:
+            self._column_expressions = {}
+        elif table_alias in self._column_expressions:
+            return self._column_expressions[table_alias]
         expression = self.expression.resolve_column_references(self.engine.dialect, table_alias)
-        return Expression.construct_expr_as_name(expression, self.name)
+        column_expression = Expression.construct_expr_as_name(expression, self.name)
+        self._column_expressions[table_alias] = column_expression
+        return column_expression
 
     def _get_supported(
         self,
@@ -625,7 +680,12 @@ class Series(ABC):
         from bach.merge import MergeSqlModel
         if not (other.expression.is_constant or other.expression.is_independent_subquery):
             # we should maybe create a subquery
-            if self.base_node != other.base_node or self.group_by != other.group_by:
+            # Series derived from the same DataFrame share their base_node and group_by, so first check
+            # identity before doing a full comparison.
+            if (
+                (self._base_node is not other._base_node and self._base_node != other._base_node)
+                or (self._group_by is not other._group_by and self._group_by != other._group_by)
+            ):
                 if other.expression.is_single_value:
                     other = self.as_independent_subquery(other)
                 else:
@@ -842,15 +902,18 @@ class Series(ABC):
 
         The DataFrame returned has the grouping and sorting also set like this Series had.
         """
-        if self._sorted_ascending is not None:
-            order_by = [SortColumn(expression=self.expression, asc=self._sorted_ascending)]
-        elif self.index_sorting:
-            order_by = []
-            for i, index_series in enumerate(self.index.values()):
-                asc = self.index_sorting[i]
-                order_by.append(SortColumn(expression=index_series.expression, asc=asc))
-        else:
-            order_by = []
+        if self._frame_order_by is None:
+            # DataFrame never modifies its order_by list, so we can hand out the same list every time.
+            if self._sorted_ascending is not None:
+                order_by = [SortColumn(expression=self.expression, asc=self._sorted_ascending)]
+            elif self._index_sorting:
+                order_by = [
+                    SortColumn(expression=index_series.expression, asc=asc)
+                    for index_series, asc in zip(self._index.values(), self._index_sorting)
+                ]
+            else:
+                order_by = []
+            self._frame_order_by = order_by
         from bach.savepoints import Savepoints
         return DataFrame(
             engine=self._engine,
@@ -858,7 +921,7 @@ class Series(ABC):
             index=self._index,
             series={self._name: self},
             group_by=self._group_by,
-            order_by=order_by,
+            order_by=self._frame_order_by,
             savepoints=Savepoints(),
             variables={}
         )
@@ -931,7 +994,7 @@ class Series(ABC):
         """
         in_expr = Expression.construct('{} {}', self, Series.as_independent_subquery(other, 'in'))
         from bach import SeriesBoolean
-        return self.copy_override_type(SeriesBoolean).copy_override(expression=in_expr)
+        return self.copy_override_type(SeriesBoolean, expression=in_expr)
 
     def astype(self, dtype: Union[str, Type]) -> 'Series':
         """
@@ -950,7 +1013,7 @@ class Series(ABC):
             expression=self.expression
         )
         new_dtype = series_type.dtype
-        return self.copy_override_dtype(dtype=new_dtype).copy_override(expression=expression)
+        return self.copy_override_dtype(dtype=new_dtype, expression=expression)
 
     def equals(self, other: Any, recursion: str = None) -> bool:
         """
@@ -959,19 +1022,23 @@ class Series(ABC):
         This strictly checks that other is the same type as self. If other is a subclass this will return
         False.
         """
+        if self is other:
+            return True
         if not isinstance(other, self.__class__) or not isinstance(self, other.__class__):
             return False
+        # Cheap checks first, and compare the private attributes so we don't copy anything. The index is
+        # compared last, as that recursively compares the index series.
         return (
-                dict_name_series_equals(self.index, other.index) and
-                self.engine == other.engine and
-                self.base_node == other.base_node and
-                self.name == other.name and
-                self.expression == other.expression and
+                self._name == other._name and
+                self._sorted_ascending == other._sorted_ascending and
+                self._index_sorting == other._index_sorting and
+                self._engine == other._engine and
+                (self._expression is other._expression or self._expression == other._expression) and
+                (self._base_node is other._base_node or self._base_node == other._base_node) and
+                self._instance_dtype == other._instance_dtype and
                 # avoid loops here.
-                (recursion == 'GroupBy' or self.group_by == other.group_by) and
-                self.sorted_ascending == other.sorted_ascending and
-                self.index_sorting == other.index_sorting and
-                self.instance_dtype == other.instance_dtype
+                (recursion == 'GroupBy' or self._group_by == other._group_by) and
+                (self._index is other._index or dict_name_series_equals(self._index, other._index))
         )
 
     def __getitem__(self, key: Union[Any, slice]):
@@ -982,21 +1049,22 @@ class Series(ABC):
         :note: When slicing, the caller is responsible for the order of the sliced Series as data returned
             can be ordered non-deterministically.
         """
-        frame = self.to_frame()
         if isinstance(key, slice):
             if self.expression.is_single_value:
                 raise ValueError('Slicing on single value expressions is not supported.')
-            return frame[key][self.name]
+            return self.to_frame()[key][self.name]
 
-        if len(self.index) == 0:
+        if len(self._index) == 0:
             raise Exception('Not supported on Series without index. '
                             'Use .values[index] instead.')
-        if len(self.index) > 1:
+        if len(self._index) > 1:
             raise NotImplementedError('Index only implemented for simple indexes. '
                                       'Use .values[index] instead')
 
-        # Apply Boolean selection on index == key, help mypy a bit
-        frame = cast(DataFrame, frame[list(frame.index.values())[0] == key])
+        # Apply Boolean selection on index == key, help mypy a bit. The frame shares our index series, so we
+        # can compare with our own index series directly.
+        index_series = next(iter(self._index.values()))
+        frame = cast(DataFrame, self.to_frame()[index_series == key])
         # limit to 1 row, will make all series SingleValueExpression, and get that series.
         return frame[:1][self.name]
 
@@ -1012,13 +1080,9 @@ class Series(ABC):
         --------
         notnull
         """
-        expression_str = f'{{}} is null'
-        expression = NonAtomicExpression.construct(
-            expression_str,
-            self
-        )
+        expression = NonAtomicExpression.construct('{} is null', self)
         from bach import SeriesBoolean
-        return self.copy_override_type(SeriesBoolean).copy_override(expression=expression)
+        return self.copy_override_type(SeriesBoolean, expression=expression)
 
     def notnull(self) -> 'SeriesBoolean':
         """
@@ -1032,13 +1096,9 @@ class Series(ABC):
         --------
         isnull
         """
-        expression_str = f'{{}} is not null'
-        expression = NonAtomicExpression.construct(
-            expression_str,
-            self
-        )
+        expression = NonAtomicExpression.construct('{} is not null', self)
         from bach import SeriesBoolean
-        return self.copy_override_type(SeriesBoolean).copy_override(expression=expression)
+        return self.copy_override_type(SeriesBoolean, expression=expression)
 
     def fillna(self, other: AllSupportedLiteralTypes):
         """
@@ -1057,7 +1117,7 @@ class Series(ABC):
         """
         return self._binary_operation(
             other=other, operation='fillna', fmt_str='COALESCE({}, {})',
-            other_dtypes=tuple([self.dtype]))
+            other_dtypes=(self.dtype,))
 
     def _binary_operation(
         self,
@@ -1085,7 +1145,8 @@ class Series(ABC):
             raise NotImplementedError(f'binary operation {operation} not supported '
                                       f'for {self.__class__} and {other.__class__}')
 
-        other = value_to_series(base=self, value=other)
+        if not isinstance(other, Series):
+            other = value_to_series(base=self, value=other)
         self_modified, other = self._get_supported(operation, other_dtypes, other)
         expression = NonAtomicExpression.construct(fmt_str, self_modified, other)
 
@@ -1098,7 +1159,7 @@ class Series(ABC):
             else:
                 new_dtype = dtype[other.dtype]
 
-        return self_modified.copy_override_dtype(dtype=new_dtype).copy_override(expression=expression)
+        return self_modified.copy_override_dtype(dtype=new_dtype, expression=expression)
 
     def _arithmetic_operation(
         self,
@@ -1173,7 +1234,7 @@ class Series(ABC):
                             f'{self.__class__} and {other.__class__}')
         return cast('SeriesBoolean', self._binary_operation(
             other=other, operation=f"comparator '{comparator}'",
-            fmt_str=f'{{}} {comparator} {{}}',
+            fmt_str=_comparator_fmt(comparator),
             other_dtypes=other_dtypes, dtype='bool'
         ))
 
@@ -1221,12 +1282,15 @@ class Series(ABC):
         series = {}
         for fn in func:
             if isinstance(fn, str):
-                series_name = f'{self.name}_{fn}'
-                fn = cast(Callable, getattr(self, fn))
+                series_name = f'{self._name}_{fn}'
+                # Look up the function on the class, so we don't create a bound method just to unbind it.
+                fn = cast(Callable, getattr(self.__class__, fn))
             elif callable(fn):
                 series_name = f'{self._name}_{fn.__name__}'
             else:
                 raise ValueError("func {fn} is not callable")
+            if series_name in series:
+                raise ValueError(f'duplicate series target name {series_name}')
 
             # If the method is bound yet (__self__ set), we need to use the unbound function
             # to make sure call the method on the right series
@@ -1234,9 +1298,9 @@ class Series(ABC):
                 fn = cast(Callable, fn.__func__)  # type: ignore[attr-defined]
 
             fn_applied_series = fn(self, *args, **kwargs)
-            if series_name in series:
-                raise ValueError(f'duplicate series target name {series_name}')
-            series[series_name] = fn_applied_series.copy_override(name=series_name)
+            if fn_applied_series.name != series_name:
+                fn_applied_series = fn_applied_series.copy_override(name=series_name)
+            series[series_name] = fn_applied_series
 
         return list(series.values())
 
@@ -1378,9 +1442,11 @@ class Series(ABC):
                         f'{min_count} != {partition.min_values}'
                     )
             else:
+                # Pass min_count as an argument, so the format string is the same for all values of
+                # min_count and only gets parsed once.
                 expression = Expression.construct(
-                    f'CASE WHEN {{}} >= {min_count} THEN {{}} ELSE NULL END',
-                    self.count(partition, skipna=skipna), expression
+                    'CASE WHEN {} >= {} THEN {} ELSE NULL END',
+                    self.count(partition, skipna=skipna), Expression.raw(str(min_count)), expression
                 )
         derived_dtype = self.dtype if dtype is None else dtype
 
@@ -1449,7 +1515,7 @@ class Series(ABC):
         return self._derived_agg_func(
             partition=partition,
             expression=AggregateFunctionExpression.construct(
-                f'percentile_disc(0.5) WITHIN GROUP (ORDER BY {{}})', self),
+                'percentile_disc(0.5) WITHIN GROUP (ORDER BY {})', self),
             skipna=skipna
         )
 
@@ -1543,7 +1609,7 @@ class Series(ABC):
 
         if not agg_function.supports_window_frame_clause(dialect=self.engine.dialect):
             # remove boundaries if the functions does not support window frame clause
-            return checked_window.set_frame_clause(start_boundary=None, end_boundary=None)
+            return checked_window.without_frame_clause()
 
         return checked_window
 
@@ -1553,7 +1619,7 @@ class Series(ABC):
         """
         from bach.partitioning import WindowFunction
         window = self._check_window(WindowFunction.ROW_NUMBER, window)
-        return self._derived_agg_func(window, Expression.construct('row_number()'), 'int64')
+        return self._derived_agg_func(window, _ROW_NUMBER_EXPRESSION, 'int64')
 
     def window_rank(self, window: WrappedWindow = None):
         """
@@ -1562,7 +1628,7 @@ class Series(ABC):
         """
         from bach.partitioning import WindowFunction
         window = self._check_window(WindowFunction.RANK, window)
-        return self._derived_agg_func(window, Expression.construct('rank()'), 'int64')
+        return self._derived_agg_func(window, _RANK_EXPRESSION, 'int64')
 
     def window_dense_rank(self, window: WrappedWindow = None):
         """
@@ -1571,7 +1637,7 @@ class Series(ABC):
         """
         from bach.partitioning import WindowFunction
         window = self._check_window(WindowFunction.DENSE_RANK, window)
-        return self._derived_agg_func(window, Expression.construct('dense_rank()'), 'int64')
+        return self._derived_agg_func(window, _DENSE_RANK_EXPRESSION, 'int64')
 
     def window_percent_rank(self, window: WrappedWindow = None):
         """
@@ -1581,7 +1647,7 @@ class Series(ABC):
         """
         from bach.partitioning import WindowFunction
         window = self._check_window(WindowFunction.PERCENT_RANK, window)
-        return self._derived_agg_func(window, Expression.construct('percent_rank()'), "double precision")
+        return self._derived_agg_func(window, _PERCENT_RANK_EXPRESSION, "double precision")
 
     def window_cume_dist(self, window: WrappedWindow = None):
         """
@@ -1591,7 +1657,7 @@ class Series(ABC):
         """
         from bach.partitioning import WindowFunction
         window = self._check_window(WindowFunction.CUME_DIST, window)
-        return self._derived_agg_func(window, Expression.construct('cume_dist()'), "double precision")
+        return self._derived_agg_func(window, _CUME_DIST_EXPRESSION, "double precision")
 
     def window_ntile(self, num_buckets: int = 1, window: WrappedWindow = None):
         """
@@ -1600,7 +1666,9 @@ class Series(ABC):
         """
         from bach.partitioning import WindowFunction
         window = self._check_window(WindowFunction.NTILE, window)
-        return self._derived_agg_func(window, Expression.construct(f'ntile({num_buckets})'), "int64")
+        return self._derived_agg_func(
+            window, Expression.construct('ntile({})', Expression.raw(str(num_buckets))), "int64"
+        )
 
     def window_lag(self, offset: int = 1, default: Any = None, window: WrappedWindow = None):
         """
@@ -1615,12 +1683,8 @@ class Series(ABC):
         from bach.partitioning import WindowFunction
         # TODO Lag, lead etc. could check whether the window is setup correctly to include that value
         window = self._check_window(WindowFunction.LAG, window)
-        default_expr = self.value_to_expression(dialect=self.engine.dialect, value=default, dtype=self.dtype)
-        return self._derived_agg_func(
-            window,
-            Expression.construct(f'lag({{}}, {offset}, {{}})', self, default_expr),
-            self.dtype
-        )
+        expression = self._offset_window_expression('lag', offset, default)
+        return self._derived_agg_func(window, expression, self.dtype)
 
     def window_lead(self, offset: int = 1, default: Any = None, window: WrappedWindow = None):
         """
@@ -1634,12 +1698,20 @@ class Series(ABC):
         """
         from bach.partitioning import WindowFunction
         window = self._check_window(WindowFunction.LEAD, window)
+        expression = self._offset_window_expression('lead', offset, default)
+        return self._derived_agg_func(window, expression, self.dtype)
+
+    def _offset_window_expression(self, function_name: str, offset: int, default: Any) -> Expression:
+        """
+        Return the expression for calling the lag or lead function on this Series.
+        If default is None, then the default argument is left out, as NULL is the default of both functions
+        already.
+        """
+        offset_expr = Expression.raw(str(offset))
+        if default is None:
+            return Expression.construct(f'{function_name}({{}}, {{}})', self, offset_expr)
         default_expr = self.value_to_expression(dialect=self.engine.dialect, value=default, dtype=self.dtype)
-        return self._derived_agg_func(
-            window,
-            Expression.construct(f'lead({{}}, {offset}, {{}})', self, default_expr),
-            self.dtype
-        )
+        return Expression.construct(f'{function_name}({{}}, {{}}, {{}})', self, offset_expr, default_expr)
 
     def window_first_value(self, window: WrappedWindow = None):
         """
@@ -1670,7 +1742,7 @@ class Series(ABC):
         window = self._check_window(WindowFunction.NTH_VALUE, window)
         return self._derived_agg_func(
             window,
-            Expression.construct(f'nth_value({{}}, {n})', self),
+            Expression.construct('nth_value({}, {})', self, Expression.raw(str(n))),
             self.dtype
         )
 
@@ -2,18 +2,62 @@
 Copyright 2021 Objectiv B.V.
 """
 from abc import ABC
-from typing import cast
+from functools import lru_cache
+from typing import cast, List, Optional
 
 from sqlalchemy.engine import Dialect
 
-from bach.series import Series
-from bach.expression import Expression
+from bach.series import Series, value_to_series
+from bach.expression import Expression, NonAtomicExpression
 from bach.series.series import WrappedPartition
 from bach.types import StructuredDtype
 from sql_models.constants import DBDialect
 from sql_models.util import is_postgres
 
 
+# Format string of the expression created by SeriesBoolean.__invert__()
+_NOT_FMT = 'NOT ({})'
+# Associative operators, for which chained applications can be flattened
+_ASSOCIATIVE_OPERATORS = ('AND', 'OR')
+
+
+@lru_cache(maxsize=None)
+def _boolean_operator_fmt(operator: str) -> str:
+    """ Format string for applying the boolean operator to two operands. """
+    return f'({{}}) {operator} ({{}})'
+
+
+def _boolean_operands(expression: Expression, operator: str) -> Optional[List[Expression]]:
+    """
+    If expression is the result of applying the operator to two or more operands, i.e. it has the form
+    `(a) AND (b) AND ...`, then return the operands. Otherwise return None.
+    """
+    if type(expression) is not NonAtomicExpression:
+        return None
+    return expression.get_joined_construct_args(f' {operator} ')
+
+
+def _flatten_boolean_expression(expression: Expression, operator: str) -> Expression:
+    """
+    Flatten nested applications of an associative operator, e.g. `((a) AND (b)) AND (c)` becomes
+    `(a) AND (b) AND (c)`. Returns expression unchanged if there is nothing to flatten.
+    """
+    operands = _boolean_operands(expression, operator)
+    if operands is None:
+        return expression
+    flattened: List[Expression] = []
+    for operand in operands:
+        nested = _boolean_operands(operand, operator)
+        if nested is None:
+            flattened.append(operand)
+        else:
+            flattened.extend(nested)
+    if len(flattened) == len(operands):
+        return expression
+    fmt = f' {operator} '.join(['({})'] * len(flattened))
+    return NonAtomicExpression.construct(fmt, *flattened)
+
+
 class SeriesBoolean(Series, ABC):
     """
     A Series that represents the Boolean type and its specific operations
@@ -75,34 +119,70 @@ class SeriesBoolean(Series, ABC):
             if source_dtype == 'int64':
                 return Expression.construct('{} != 0', expression)
         # Default case: do a regular cast
-        return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', expression)
+        return cls._cast_to_db_dtype(dialect, expression)
 
-    def _comparator_operation(self, other, comparator, other_dtypes=tuple(['bool'])) -> 'SeriesBoolean':
+    def _comparator_operation(self, other, comparator, other_dtypes=('bool',)) -> 'SeriesBoolean':
         return super()._comparator_operation(other, comparator, other_dtypes)
 
-    def _boolean_operator(self, other, operator: str, other_dtypes=tuple(['bool'])) -> 'SeriesBoolean':
-        fmt_str = f'({{}}) {operator} ({{}})'
+    def _boolean_operator(self, other, operator: str, other_dtypes=('bool',)) -> 'SeriesBoolean':
+        if not isinstance(other, Series):
+            other = value_to_series(base=self, value=other)
+        fmt_str = _boolean_operator_fmt(operator)
         if other.dtype != 'bool':
             # this is not currently used, as both bigint and float can not be cast to bool in PG
             fmt_str = f'({{}}) {operator} cast({{}} as bool)'
-        return cast(
+        result = cast(
             'SeriesBoolean', self._binary_operation(
                 other=other, operation=f"boolean operator '{operator}'",
                 fmt_str=fmt_str, other_dtypes=other_dtypes, dtype='bool'
             )
         )
+        if operator in _ASSOCIATIVE_OPERATORS:
+            expression = _flatten_boolean_expression(result.expression, operator)
+            if expression is not result.expression:
+                result = result.copy_override(expression=expression)
+        return result
+
+    def _constant(self, value: bool) -> Optional['SeriesBoolean']:
+        """
+        Return a copy of this Series with its expression replaced by the constant value, or None if that's not
+        possible. The latter is the case if this Series is an aggregation or window function: the constant
+        would not be one, while the Series still has its group_by.
+        """
+        if self.expression.has_aggregate_function or self.expression.has_windowed_aggregate_function:
+            return None
+        expression = self.value_to_expression(dialect=self.engine.dialect, value=value, dtype=self.dtype)
+        return self.copy_override(expression=expression)
 
     def __invert__(self) -> 'SeriesBoolean':
-        expression = Expression.construct('NOT ({})', self)
+        # ~(~x) == x, also if x is NULL
+        if type(self.expression) is Expression:
+            args = self.expression.get_construct_args(_NOT_FMT)
+            if args is not None:
+                return self.copy_override(expression=args[0])
+        expression = Expression.construct(_NOT_FMT, self)
         return self.copy_override(expression=expression)
 
+    # If the rhs is a python bool, then the result can be determined without generating an AND, OR or
+    # XOR expression. The foldings below also hold if the lhs is NULL, following SQL's three-valued logic.
+
     def __and__(self, other) -> 'SeriesBoolean':
+        if isinstance(other, bool):
+            result = self if other else self._constant(False)
+            if result is not None:
+                return result
         return self._boolean_operator(other, 'AND')
 
     def __or__(self, other) -> 'SeriesBoolean':
+        if isinstance(other, bool):
+            result = self._constant(True) if other else self
+            if result is not None:
+                return result
         return self._boolean_operator(other, 'OR')
 
     def __xor__(self, other) -> 'SeriesBoolean':
+        if isinstance(other, bool):
+            return ~self if other else self
         # This only works if both type are 'bool' in PG, but if the rhs is not, it will be cast
         # explicitly in _boolean_operator()
         return self._boolean_operator(other, '!=')
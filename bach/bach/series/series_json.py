@@ -2,7 +2,7 @@
 Copyright 2021 Objectiv B.V.
 """
 import json
-from typing import Optional, Dict, Union, TYPE_CHECKING, List, Tuple
+from typing import Optional, Dict, Union, TYPE_CHECKING, List, Tuple, Mapping
 
 from sqlalchemy.engine import Dialect
 
@@ -324,7 +324,7 @@ class SeriesJsonb(Series):
     def supported_literal_to_expression(cls, dialect: Dialect, literal: Expression) -> Expression:
         if not is_postgres(dialect):
             raise DatabaseNotSupportedException(dialect)
-        return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', literal)
+        return cls._cast_to_db_dtype(dialect, literal)
 
     @classmethod
     def supported_value_to_literal(
@@ -342,7 +342,7 @@ class SeriesJsonb(Series):
             return expression
         if source_dtype != 'string':
             raise ValueError(f'cannot convert {source_dtype} to jsonb')
-        return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', expression)
+        return cls._cast_to_db_dtype(dialect, expression)
 
     def _comparator_operation(self, other, comparator, other_dtypes=('json', 'jsonb')):
         return self._binary_operation(
@@ -389,7 +389,7 @@ class SeriesJson(SeriesJsonb):
     def __init__(self,
                  engine,
                  base_node: BachSqlModel,
-                 index: Dict[str, 'Series'],
+                 index: Mapping[str, 'Series'],
                  name: str,
                  expression: Expression,
                  group_by: 'GroupBy',
@@ -5,7 +5,7 @@ import operator
 from abc import ABC, abstractmethod
 from copy import copy
 from functools import reduce
-from typing import Union, List, Optional, Dict, Any, cast, TypeVar, Tuple, Type, TYPE_CHECKING
+from typing import Union, List, Optional, Dict, Any, cast, TypeVar, Tuple, Type, TYPE_CHECKING, Mapping
 
 from bach import DataFrameOrSeries
 from bach.series.series import Series
@@ -52,7 +52,7 @@ class SeriesAbstractMultiLevel(Series, ABC):
         *,
         engine: Optional[Engine] = None,
         base_node: Optional[BachSqlModel] = None,
-        index: Optional[Dict[str, 'Series']] = None,
+        index: Optional[Mapping[str, 'Series']] = None,
         name: Optional[str] = None,
         expression: Optional['Expression'] = None,
         group_by: Optional[Union['GroupBy', NotSet]] = not_set,
@@ -86,7 +86,7 @@ class SeriesAbstractMultiLevel(Series, ABC):
         cls,
         engine: Engine,
         base_node: BachSqlModel,
-        index: Dict[str, 'Series'],
+        index: Mapping[str, 'Series'],
         name: str,
         expression: Expression,
         group_by: Optional['GroupBy'],
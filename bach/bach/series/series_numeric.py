@@ -2,14 +2,14 @@
 Copyright 2021 Objectiv B.V.
 """
 from abc import ABC
-from typing import cast, Union, TYPE_CHECKING, Optional, List, Tuple
+from typing import cast, Union, TYPE_CHECKING, Optional, List, Tuple, Mapping
 
 import numpy
 from sqlalchemy.engine import Dialect
 
 from bach.series import Series
-from bach.expression import Expression, AggregateFunctionExpression
-from bach.series.series import WrappedPartition
+from bach.expression import Expression, AggregateFunctionExpression, NonAtomicExpression
+from bach.series.series import WrappedPartition, value_to_series
 from bach.types import StructuredDtype
 from sql_models.constants import DBDialect
 from sql_models.util import is_postgres, is_bigquery, DatabaseNotSupportedException
@@ -40,6 +40,20 @@ class SeriesAbstractNumeric(Series, ABC):
     def _comparator_operation(self, other, comparator, other_dtypes=('int64', 'float64')) -> 'SeriesBoolean':
         return super()._comparator_operation(other, comparator, other_dtypes)
 
+    def __mod__(self, other) -> 'Series':
+        # PG is picky in data types, so we solve it like this:
+        #   dividend - floor(dividend / divisor) * divisor
+        # We build that as a single expression, instead of chaining a floordiv, mul, and sub operation that
+        # each create and check an intermediate Series.
+        other = value_to_series(base=self, value=other)
+        self_modified, other = self._get_supported('mod', ('int64', 'float64'), other)
+        expression = NonAtomicExpression.construct(
+            '{} - floor({} / {}) * {}', self_modified, self_modified, other, other
+        )
+        # Result is a float if either side is a float, otherwise the dtype of self (i.e. int64)
+        new_dtype = 'float64' if other.dtype == 'float64' else None
+        return self_modified.copy_override_dtype(dtype=new_dtype, expression=expression)
+
     def round(self, decimals: int = 0) -> 'SeriesAbstractNumeric':
         """
         Round the value of this series to the given amount of decimals.
@@ -200,6 +214,13 @@ class SeriesAbstractNumeric(Series, ABC):
         return self.to_frame().minmax_scale(feature_range)[self.name]
 
 
+# Result dtypes of arithmetic operations on int64 Series, keyed on the dtype of the other operand
+_INT64_ARITHMETIC_TYPE_MAPPING: Mapping[str, Optional[str]] = {
+    'int64': 'int64',
+    'float64': 'float64'
+}
+
+
 class SeriesInt64(SeriesAbstractNumeric):
     """
     Series type for integer data.
@@ -238,7 +259,7 @@ class SeriesInt64(SeriesAbstractNumeric):
             # consistently get bigints, so always cast the result
             # See the section on numeric constants in the Postgres documentation
             # https://www.postgresql.org/docs/14/sql-syntax-lexical.html#SQL-SYNTAX-CONSTANTS
-            return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', literal)
+            return cls._cast_to_db_dtype(dialect, literal)
         if is_bigquery(dialect):
             # BigQuery has only one integer type, so there is no confusion between 32-bit and 64-bit integers
             # https://cloud.google.com/bigquery/docs/reference/standard-sql/data-types#integer_type
@@ -261,14 +282,11 @@ class SeriesInt64(SeriesAbstractNumeric):
             return expression
         if source_dtype not in ['float64', 'bool', 'string']:
             raise ValueError(f'cannot convert {source_dtype} to int64')
-        return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', expression)
+        return cls._cast_to_db_dtype(dialect, expression)
 
     def _arithmetic_operation(self, other, operation, fmt_str, other_dtypes=('int64', 'float64'), dtype=None):
         # Override this method, because we need to return a float if we interact with one.
-        type_mapping = dtype if dtype else {
-            'int64': 'int64',
-            'float64': 'float64'
-        }
+        type_mapping = dtype if dtype else _INT64_ARITHMETIC_TYPE_MAPPING
         return super()._arithmetic_operation(other, operation, fmt_str, other_dtypes, type_mapping)
 
     def __truediv__(self, other) -> 'Series':
@@ -278,15 +296,15 @@ class SeriesInt64(SeriesAbstractNumeric):
         if is_postgres(self.engine):
             # Postgres expects the argument to a bitshift to be a regular int, not bigint.
             return self._arithmetic_operation(other, 'rshift', '({}) >> cast({} as int)',
-                                              other_dtypes=tuple(['int64']))
-        return self._arithmetic_operation(other, 'rshift', '({}) >> ({})', other_dtypes=tuple(['int64']))
+                                              other_dtypes=('int64',))
+        return self._arithmetic_operation(other, 'rshift', '({}) >> ({})', other_dtypes=('int64',))
 
     def __lshift__(self, other):
         if is_postgres(self.engine):
             # Postgres expects the argument to a bitshift to be a regular int, not bigint.
             return self._arithmetic_operation(other, 'lshift', '({}) << cast({} as int)',
-                                              other_dtypes=tuple(['int64']))
-        return self._arithmetic_operation(other, 'lshift', '({}) << ({})', other_dtypes=tuple(['int64']))
+                                              other_dtypes=('int64',))
+        return self._arithmetic_operation(other, 'lshift', '({}) << ({})', other_dtypes=('int64',))
 
     def sum(self, partition: WrappedPartition = None, skipna: bool = True, min_count: int = None, **kwargs):
         # sum() has the tendency to return float on bigint arguments. Cast it back.
@@ -348,7 +366,7 @@ class SeriesFloat64(SeriesAbstractNumeric):
 
     @classmethod
     def supported_literal_to_expression(cls, dialect: Dialect, literal: Expression) -> Expression:
-        return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', literal)
+        return cls._cast_to_db_dtype(dialect, literal)
 
     @classmethod
     def supported_value_to_literal(
@@ -365,4 +383,4 @@ class SeriesFloat64(SeriesAbstractNumeric):
             return expression
         if source_dtype not in ['int64', 'string']:
             raise ValueError(f'cannot convert {source_dtype} to float64')
-        return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', expression)
+        return cls._cast_to_db_dtype(dialect, expression)
@@ -144,7 +144,7 @@ class SeriesString(Series):
     def dtype_to_expression(cls, dialect: Dialect, source_dtype: str, expression: Expression) -> Expression:
         if source_dtype == 'string':
             return expression
-        return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', expression)
+        return cls._cast_to_db_dtype(dialect, expression)
 
     def get_dummies(
         self,
@@ -185,5 +185,5 @@ class SeriesString(Series):
     def __add__(self, other) -> 'Series':
         return self._binary_operation(other, 'concat', '{} || {}', other_dtypes=('string',))
 
-    def _comparator_operation(self, other, comparator, other_dtypes=tuple(['string'])) -> 'SeriesBoolean':
+    def _comparator_operation(self, other, comparator, other_dtypes=('string',)) -> 'SeriesBoolean':
         return super()._comparator_operation(other, comparator, other_dtypes)
@@ -1,6 +1,8 @@
 """
 Copyright 2021 Objectiv B.V.
 """
+import re
+from functools import lru_cache
 from typing import Union, Optional
 from uuid import UUID
 
@@ -15,6 +17,16 @@ from sql_models.constants import DBDialect
 from sql_models.util import is_postgres, DatabaseNotSupportedException, is_bigquery
 
 
+# Pattern of uuid strings in canonical form, i.e. the form of str(UUID(x)). See supported_value_to_literal()
+_CANONICAL_UUID_PATTERN = re.compile('[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
+@lru_cache(maxsize=4096)
+def _uuid_to_string_value(value: UUID) -> Expression:
+    """ Return the string-value Expression of the uuid. Expressions are immutable, so can be shared. """
+    return Expression.string_value(str(value))
+
+
 class SeriesUuid(Series):
     """
     A Series that represents the UUID type and has UUID specific operations.
@@ -39,7 +51,7 @@ class SeriesUuid(Series):
     @classmethod
     def supported_literal_to_expression(cls, dialect: Dialect, literal: Expression) -> Expression:
         if is_postgres(dialect):
-            return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', literal)
+            return cls._cast_to_db_dtype(dialect, literal)
         if is_bigquery(dialect):
             return literal
         raise DatabaseNotSupportedException(dialect)
@@ -52,10 +64,13 @@ class SeriesUuid(Series):
         dtype: StructuredDtype
     ) -> Expression:
         if isinstance(value, str):
-            # Check that the string value is a valid UUID by converting it to a UUID
+            if _CANONICAL_UUID_PATTERN.fullmatch(value):
+                # Already valid and in canonical form, no need to parse it
+                return Expression.string_value(value)
+            # Check that the string value is a valid UUID, and get its canonical form, by converting it to a
+            # UUID
             value = UUID(value)
-        uuid_as_str = str(value)
-        return Expression.string_value(uuid_as_str)
+        return _uuid_to_string_value(value)
 
     @classmethod
     def dtype_to_expression(cls, dialect: Dialect, source_dtype: str, expression: Expression) -> Expression:
@@ -65,7 +80,7 @@ class SeriesUuid(Series):
             if is_postgres(dialect):
                 # If the format is wrong, then this will give an error later on, but there is not much we can
                 # do about that here.
-                return Expression.construct(f'cast({{}} as {cls.get_db_dtype(dialect)})', expression)
+                return cls._cast_to_db_dtype(dialect, expression)
             if is_bigquery(dialect):
                 return expression
             raise DatabaseNotSupportedException(dialect)
@@ -129,7 +144,7 @@ class SeriesUuid(Series):
             )
         else:  # other.dtype == 'uuid' or not is_postgres(self.engine)
             expression = Expression.construct(f'({{}}) {comparator} ({{}})', self_modified, other)
-        return self_modified.copy_override_type(SeriesBoolean).copy_override(expression=expression)
+        return self_modified.copy_override_type(SeriesBoolean, expression=expression)
 
     def min(self, partition: WrappedPartition = None, skipna: bool = True):
         """ INTERNAL: Only here to not trigger errors from describe """
@@ -70,7 +70,7 @@ def get_series_type_from_db_dtype(db_dialect: DBDialect, db_dtype: str) -> Type[
 
 def value_to_series_type(value: Any) -> Type['Series']:
     """ Return the Series subclass that can represent value as literal. """
-    return get_series_type_from_dtype(dtype=value_to_dtype(value))
+    return _registry.value_to_series_type(value)
 
 
 def get_all_db_dtype_to_series() -> Mapping[DBDialect, Mapping[Dtype, Type['Series']]]:
@@ -176,6 +176,14 @@ class TypeRegistry:
         # and that is clearer with a list.
         self.value_type_to_series: List[Tuple[Type, Type['Series']]] = []
 
+        # value_type_dtype_cache: Cache of the results of value_to_dtype() per python type. Only valid for the
+        # current value_type_to_series, so it's cleared when that changes.
+        self.value_type_dtype_cache: Dict[Type, Dtype] = {}
+
+        # value_type_series_cache: Cache of the results of value_to_series_type() per python type. Only valid
+        # for the current value_type_to_series and dtype_to_series, so it's cleared when either changes.
+        self.value_type_series_cache: Dict[Type, Type['Series']] = {}
+
     def _real_init(self):
         """
         Load the default dtype, db_dtype, and value-type mappings for the standard set of Series types.
@@ -239,6 +247,7 @@ class TypeRegistry:
                 raise Exception(f'Type {klass} claims dtype (or dtype alias) {dtype_alias}, which is '
                                 f'already assigned to {self.dtype_to_series[dtype_alias]}')
             self.dtype_to_series[dtype_alias] = klass
+        self.value_type_series_cache.clear()
 
     def _register_db_dtype_klass(self, klass: Type['Series'], override=False):
         for db_dialect in klass.supported_db_dtype.keys():
@@ -260,6 +269,8 @@ class TypeRegistry:
             raise ValueError(f'Cannot register {klass} for {value_type}. Type not supported.')
         type_tuple = value_type, klass
         self.value_type_to_series.append(type_tuple)
+        self.value_type_dtype_cache.clear()
+        self.value_type_series_cache.clear()
 
     def register_dtype_series(self,
                               series_type: Type['Series'],
@@ -325,13 +336,34 @@ class TypeRegistry:
         from bach.series import Series
         if isinstance(value, Series):
             return value.dtype
+        value_type = type(value)
+        if value_type in self.value_type_dtype_cache:
+            return self.value_type_dtype_cache[value_type]
         # iterate in reverse, the last item added that matches is used in case where multiple entries
         # match.
-        for type_object, series_type in self.value_type_to_series[::-1]:
-            if isinstance(value, type_object):
+        for type_object, series_type in reversed(self.value_type_to_series):
+            if issubclass(value_type, type_object):
+                self.value_type_dtype_cache[value_type] = series_type.dtype
                 return series_type.dtype
         raise ValueError(f'No dtype known for {type(value)}')
 
+    def value_to_series_type(self, value: Any) -> Type['Series']:
+        """
+        Given a python value, return the Series subclass that's registered for the dtype of value.
+        Equivalent to get_series_type_from_dtype(value_to_dtype(value)), but with a single lookup for
+        python types that have been seen before.
+        """
+        value_type = type(value)
+        series_type = self.value_type_series_cache.get(value_type)
+        if series_type is not None:
+            return series_type
+        series_type = self.get_series_type_from_dtype(self.value_to_dtype(value))
+        from bach.series import Series
+        if not isinstance(value, Series):
+            # The dtype of a Series value depends on the instance, not on the type
+            self.value_type_series_cache[value_type] = series_type
+        return series_type
+
     def validate_is_dtype(self, dtype: StructuredDtype):
         """
         Validate that dtype is a valid dtype, either as a regular dtype string that is one of the registered
@@ -53,6 +53,10 @@ def escape_parameter_characters(conn: Connection, raw_sql: str) -> str:
     return raw_sql.replace('%', '%%')
 
 
+# Pattern that BigQuery column names must match, see is_valid_column_name()
+_BIGQUERY_COLUMN_NAME_PATTERN = re.compile('^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+
 def is_valid_column_name(dialect: Dialect, name: str) -> bool:
     """
     Check that the given name is a valid column name in the SQL dialect.
@@ -66,7 +70,6 @@ def is_valid_column_name(dialect: Dialect, name: str) -> bool:
         # sources:
         #  https://cloud.google.com/bigquery/docs/reference/standard-sql/lexical#column_names
         #  https://cloud.google.com/bigquery/docs/schemas#column_names
-        regex = '^[a-zA-Z_][a-zA-Z0-9_]*$'
         reserved_prefixes = [
             '_TABLE_',
             '_FILE_',
@@ -76,7 +79,7 @@ def is_valid_column_name(dialect: Dialect, name: str) -> bool:
             '_COLIDENTIFIER'
         ]
         len_ok = len(name) <= 300
-        pattern_ok = bool(re.match(pattern=regex, string=name))
+        pattern_ok = bool(_BIGQUERY_COLUMN_NAME_PATTERN.match(name))
         prefix_ok = not any(name.startswith(prefix) for prefix in reserved_prefixes)
         return len_ok and pattern_ok and prefix_ok
     raise DatabaseNotSupportedException(dialect)
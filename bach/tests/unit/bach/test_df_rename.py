@@ -1,14 +1,31 @@
 """
 Copyright 2021 Objectiv B.V.
 """
+from typing import Dict
+
 import pytest
+from sqlalchemy.engine import Dialect
 
+from bach import DataFrame
 from tests.unit.bach.util import get_fake_df_test_data, get_fake_df
 
 
-def test_rename_basic(dialect):
-    bt = get_fake_df_test_data(dialect)
+@pytest.fixture(scope='module')
+def bt_templates() -> Dict[Dialect, DataFrame]:
+    # Test data per dialect, shared by the tests in this module and filled by the bt fixture. The dialect
+    # fixture is function-scoped, so a module-scoped fixture cannot create the data itself.
+    return {}
+
+
+@pytest.fixture()
+def bt(dialect, bt_templates) -> DataFrame:
+    # Return a copy, so that tests cannot affect each other through the shared template
+    if dialect not in bt_templates:
+        bt_templates[dialect] = get_fake_df_test_data(dialect)
+    return bt_templates[dialect].copy()
+
 
+def test_rename_basic(bt):
     nbt = bt.rename(columns={'founding': 'fnd'})
     assert 'founding' not in nbt.data.keys()
     assert 'fnd' in nbt.data.keys()
@@ -17,25 +34,22 @@ def test_rename_basic(dialect):
     assert bt.founding.expression == nbt.fnd.expression
 
 
-def test_rename_self(dialect):
+def test_rename_self(bt):
     # rename to self
-    bt = get_fake_df_test_data(dialect)
     nbt = bt.rename(columns={'city': 'city'})
     assert 'city' in nbt.data.keys()
     assert 'city' in bt.data.keys()
 
 
-def test_rename_check_order(dialect):
+def test_rename_check_order(bt):
     # regression guard: make sure the order of columns is correct
-    bt = get_fake_df_test_data(dialect)
     nbt = bt.rename(columns={'city': 'city', 'municipality': 'muni', 'founding': 'fnd'})
     assert 'city' in nbt.data.keys()
     assert 'city' in bt.data.keys()
     assert nbt.data_columns == ['skating_order', 'city', 'muni', 'inhabitants', 'fnd']
 
 
-def test_rename_swap(dialect):
-    bt = get_fake_df_test_data(dialect)
+def test_rename_swap(bt):
     expr_inhabitants = bt.inhabitants.expression
     expr_city = bt.city.expression
     nbt = bt.rename(columns={'city': 'inhabitants', 'inhabitants': 'city'})
@@ -45,8 +59,7 @@ def test_rename_swap(dialect):
     assert nbt.inhabitants.expression == expr_city
 
 
-def test_rename_multiple(dialect):
-    bt = get_fake_df_test_data(dialect)
+def test_rename_multiple(bt):
     nbt = bt.rename(columns={'founding': 'fnd', 'city': 'cty'})
     assert 'founding' not in nbt.data.keys()
     assert 'fnd' in nbt.data.keys()
@@ -58,8 +71,7 @@ def test_rename_multiple(dialect):
     assert 'cty' not in bt.data.keys()
 
 
-def test_rename_mapper_dict(dialect):
-    bt = get_fake_df_test_data(dialect)
+def test_rename_mapper_dict(bt):
     nbt = bt.rename(mapper={'city': 'cty'}, axis=1)
     assert 'city' not in nbt.data.keys()
     assert 'cty' in nbt.data.keys()
@@ -67,8 +79,7 @@ def test_rename_mapper_dict(dialect):
     assert 'cty' not in bt.data.keys()
 
 
-def test_rename_mapper_function(dialect):
-    bt = get_fake_df_test_data(dialect)
+def test_rename_mapper_function(bt):
     nbt = bt.rename(mapper=lambda x: x[::-1], axis=1)
     assert 'city' not in nbt.data.keys()
     assert 'ytic' in nbt.data.keys()
@@ -76,18 +87,15 @@ def test_rename_mapper_function(dialect):
     assert 'ytic' not in bt.data.keys()
 
 
-def test_rename_mapper_self(dialect):
-    bt = get_fake_df_test_data(dialect)
+def test_rename_mapper_self(bt):
     expr = bt.city.expression
-    bt = get_fake_df_test_data(dialect)
     nbt = bt.rename(mapper=lambda x: x, axis=1)
     assert 'city' in nbt.data.keys()
     assert 'city' in bt.data.keys()
     assert bt.city.expression == expr
 
 
-def test_rename_ignore_errors(dialect):
-    bt = get_fake_df_test_data(dialect)
+def test_rename_ignore_errors(bt):
     bt.rename(columns={'non existing column': 'new name'}, errors='ignore')
 
     with pytest.raises(KeyError):
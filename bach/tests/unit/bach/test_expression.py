@@ -1,11 +1,14 @@
 """
 Copyright 2021 Objectiv B.V.
 """
+import pickle
+
 import pytest
 
 from bach.expression import RawToken, ColumnReferenceToken, StringValueToken, Expression, \
     ConstValueExpression, AggregateFunctionExpression, WindowFunctionExpression, SingleValueExpression, \
     NonAtomicExpression, TableColumnReferenceToken
+from sql_models.model import CustomSqlModelBuilder
 from sql_models.util import is_bigquery
 from tests.unit.bach.util import get_fake_df
 
@@ -35,6 +38,15 @@ def test_construct(dialect):
     with pytest.raises(ValueError):
         Expression.construct('{}', expr, expr)
 
+    # plain expressions that only wrap a single other plain expression are not nested
+    wrapped = Expression([Expression([expr])])
+    assert Expression.construct('te{}st', wrapped) == \
+           Expression([RawToken('te'), Expression([RawToken('test')]), RawToken('st')])
+    const_wrapped = Expression([ConstValueExpression([RawToken('1')])])
+    result = Expression.construct('{} + 1', const_wrapped)
+    assert result == Expression([const_wrapped, RawToken(' + 1')])
+    assert result.to_sql(dialect) == '1 + 1'
+
 
 def test_construct_series(dialect):
     df = get_fake_df(dialect, ['i'], ['a', 'b'])
@@ -263,3 +275,61 @@ def test_has_table_column_reference() -> None:
 
     expr2 = Expression.column_reference('city')
     assert not expr2.has_table_column_references
+
+
+def test_to_sql_cached(dialect) -> None:
+    expr = Expression.construct('cast({} as text)', Expression.column_reference('city'))
+    sql = expr.to_sql(dialect)
+    sql_table = expr.to_sql(dialect, 'tab')
+    assert sql != sql_table
+    # Expressions are immutable, compiling again should give the exact same result objects
+    assert expr.to_sql(dialect) is sql
+    assert expr.to_sql(dialect, 'tab') is sql_table
+    assert expr.resolve_column_references(dialect, 'tab') is expr.resolve_column_references(dialect, 'tab')
+
+
+@pytest.mark.db_independent
+def test_raw_token_get() -> None:
+    token = RawToken.get(' + ')
+    assert token == RawToken(' + ')
+    assert RawToken.get(' + ') is token
+    assert Expression.raw(' + ').data[0] is token
+    assert Expression.construct('{} + {}', Expression.raw('a'), Expression.raw('b')).data[1] is token
+
+
+@pytest.mark.db_independent
+def test_get_construct_args() -> None:
+    a = Expression.column_reference('a')
+    b_plus_c = NonAtomicExpression.construct('{} + {}', Expression.raw('b'), Expression.raw('c'))
+    expr = Expression.construct('f({}, {})', a, b_plus_c)
+    assert expr.get_construct_args('f({}, {})') == [a, b_plus_c]
+    assert expr.get_construct_args('g({}, {})') is None
+    assert expr.get_construct_args('f({})') is None
+    assert expr.get_construct_args('f({}, {}) + 1') is None
+    assert Expression.construct('NOT ({})', a).get_construct_args('NOT ({})') == [a]
+    assert Expression.construct('NOT ({})', b_plus_c).get_construct_args('NOT ({})') == [b_plus_c]
+    # tokens of an unpickled expression are not shared with those of the format string
+    assert pickle.loads(pickle.dumps(expr)).get_construct_args('f({}, {})') == [a, b_plus_c]
+
+
+@pytest.mark.db_independent
+def test_get_joined_construct_args() -> None:
+    a, b, c = Expression.raw('a'), Expression.raw('b'), Expression.raw('c')
+    a_or_b = NonAtomicExpression.construct('({}) OR ({})', a, b)
+    expr = NonAtomicExpression.construct('({}) AND ({}) AND ({})', a_or_b, b, c)
+    assert expr.get_joined_construct_args(' AND ') == [a_or_b, b, c]
+    assert expr.get_joined_construct_args(' OR ') is None
+    assert a_or_b.get_joined_construct_args(' OR ') == [a, b]
+    assert NonAtomicExpression.construct('({}) AND {}', a, b).get_joined_construct_args(' AND ') is None
+    assert pickle.loads(pickle.dumps(expr)).get_joined_construct_args(' AND ') == [a_or_b, b, c]
+
+
+@pytest.mark.db_independent
+def test_get_references() -> None:
+    model = CustomSqlModelBuilder(sql='select 1', name='model')()
+    ref_expr = Expression.model_reference(model)
+    sub_expr = Expression.construct('(select {})', ref_expr)
+    expr = Expression.construct('{} + ({})', Expression.raw('x'), sub_expr)
+    assert expr.get_references() == {f'reference{model.hash}': model}
+    assert expr.get_references() is expr.get_references()
+    assert Expression.raw('x').get_references() == {}
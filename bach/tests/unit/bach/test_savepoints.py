@@ -0,0 +1,132 @@
+"""
+Copyright 2022 Objectiv B.V.
+"""
+from dataclasses import dataclass
+from typing import Optional, List
+
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+from bach.savepoints import Savepoints, CreatedObject
+from sql_models.model import Materialization
+from sql_models.util import quote_identifier, is_postgres
+from tests.unit.bach.util import get_fake_df, FakeEngine
+
+
+def test_to_sql_cache_invalidation(dialect):
+    df = get_fake_df(dialect, ['i'], ['a'])
+    sps = Savepoints()
+    sps.add_savepoint('sp', df, Materialization.TABLE)
+    name = quote_identifier(dialect, 'sp')
+    assert sps.to_sql(dialect) == {'sp': f'create table {name} as select * from x'}
+    # modifying the result should not affect the cached result
+    sps.to_sql(dialect)['sp'] = 'modified'
+    assert sps.to_sql(dialect) == {'sp': f'create table {name} as select * from x'}
+
+    sps.set_materialization('sp', Materialization.VIEW)
+    assert sps.to_sql(dialect) == {'sp': f'create view {name} as select * from x'}
+
+    sps.remove_savepoint('sp')
+    assert sps.to_sql(dialect) == {}
+
+
+class _FakeTransaction:
+    def __init__(self, connection: '_FakeConnection'):
+        self._connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._connection.executed.append('ROLLBACK')
+
+    def commit(self):
+        self._connection.executed.append('COMMIT')
+
+
+class _FakeConnection:
+    """
+    Connection that records all executed sql, and fails on sql that contains `fail_on`.
+    Like BigQuery, it doesn't support transactional DDL: statements that were applied before a failure, also
+    those earlier in the same batch, stay applied. Applying the same statement twice fails.
+    """
+    def __init__(self, fail_on: Optional[str]):
+        self.fail_on = fail_on
+        self.executed: List[str] = []
+        self.applied: List[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def begin(self):
+        return _FakeTransaction(self)
+
+    def execute(self, sql: str):
+        self.executed.append(sql)
+        for statement in sql.split('; '):
+            if statement in self.applied:
+                raise ProgrammingError(sql, None, Exception('fake error: already exists'))
+            if self.fail_on is not None and self.fail_on in statement:
+                raise ProgrammingError(sql, None, Exception('fake error'))
+            self.applied.append(statement)
+
+
+@dataclass(frozen=True)
+class _FakeConnectableEngine(FakeEngine):
+    connection: Optional[_FakeConnection] = None
+
+    def connect(self):
+        return self.connection
+
+
+def _get_savepoints_and_engine(dialect, fail_on: Optional[str] = None):
+    sps = Savepoints()
+    df = get_fake_df(dialect, ['i'], ['a'])
+    sps.add_savepoint('sp_table', df, Materialization.TABLE)
+    df = df.materialize()
+    sps.add_savepoint('sp_view', df, Materialization.VIEW)
+    engine = _FakeConnectableEngine(dialect=dialect, connection=_FakeConnection(fail_on=fail_on))
+    return sps, engine
+
+
+def test_write_to_db_batched(dialect):
+    sps, engine = _get_savepoints_and_engine(dialect)
+    created = sps.write_to_db(engine_override=engine, overwrite=True)
+    assert created == [
+        CreatedObject(name='sp_table', materialization=Materialization.TABLE),
+        CreatedObject(name='sp_view', materialization=Materialization.VIEW),
+    ]
+    sp_table = quote_identifier(dialect, 'sp_table')
+    sp_view = quote_identifier(dialect, 'sp_view')
+    drop_statements = list(sps.get_drop_statements(dialect).values())
+    create_statements = list(sps.get_create_statements(dialect).values())
+    assert drop_statements == [f'drop view if exists {sp_view}', f'drop table if exists {sp_table}']
+    assert create_statements[0] == f'create table {sp_table} as select * from x'
+    assert create_statements[1].startswith(f'create view {sp_view} as ')
+    if is_postgres(dialect):
+        # all drop statements and all create statements are executed in one call each, in a single transaction
+        assert engine.connection.executed == [
+            '; '.join(drop_statements), '; '.join(create_statements), 'COMMIT'
+        ]
+    else:
+        assert engine.connection.executed == drop_statements + create_statements + ['COMMIT']
+
+
+def test_write_to_db_error(dialect):
+    sps, engine = _get_savepoints_and_engine(dialect, fail_on='create view')
+    create_statements = list(sps.get_create_statements(dialect).values())
+    with pytest.raises(ProgrammingError) as exc_info:
+        sps.write_to_db(engine_override=engine)
+    # The statement before the failing one stays applied, and no statement is executed a second time
+    assert engine.connection.applied == [create_statements[0]]
+    if is_postgres(dialect):
+        assert exc_info.value.statement == '; '.join(create_statements)
+        assert engine.connection.executed == ['; '.join(create_statements), 'ROLLBACK']
+    else:
+        # The raised error is for the statement of the failing savepoint
+        assert exc_info.value.statement == create_statements[1]
+        assert engine.connection.executed == create_statements + ['ROLLBACK']
@@ -1,13 +1,15 @@
 """
 Copyright 2021 Objectiv B.V.
 """
+from copy import deepcopy
 from typing import List
 
 import pytest
 
 from bach import get_series_type_from_dtype
-from bach.expression import Expression
+from bach.expression import Expression, NonAtomicExpression
 from bach.partitioning import GroupBy
+from sql_models.util import quote_identifier
 from tests.unit.bach.util import get_fake_df, FakeEngine
 
 
@@ -128,3 +130,93 @@ def test_equals_instance_dtype(dialect):
     assert sleft.equals(sright)
     sright = sleft.copy_override(instance_dtype={'a': 'float64', 'b': ['bool']})
     assert not sleft.equals(sright)
+
+
+def test_index_read_only(dialect):
+    df = get_fake_df(dialect=dialect, index_names=['a'], data_names=['b'])
+    series = df['b']
+    assert list(series.index.keys()) == ['a']
+    with pytest.raises(TypeError):
+        series.index['x'] = series  # type: ignore
+    assert series.copy_override(name='c').index['a'] is series.index['a']
+
+
+def test_deepcopy(dialect):
+    df = get_fake_df(dialect=dialect, index_names=['a'], data_names=['b'])
+    series = df['b']
+    # The dialect refers to the DB-API module, which cannot be copied. So share it between the copies.
+    series_copy = deepcopy(series, memo={id(dialect): dialect})
+    assert series_copy is not series
+    assert series_copy.index['a'] is not series.index['a']
+    assert series_copy.expression == series.expression
+    assert list(series_copy.index.keys()) == ['a']
+    assert series_copy.index['a'].expression == series.index['a'].expression
+
+
+def test_boolean_operator_constant_folding(dialect):
+    df = get_fake_df(
+        dialect=dialect, index_names=['a'], data_names=['b', 'c'],
+        dtype={'a': 'int64', 'b': 'bool', 'c': 'bool'}
+    )
+    b = df['b']
+    assert (b & True) is b
+    assert (b | False) is b
+    assert (b ^ False) is b
+    assert (b & False).expression.to_sql(dialect) == 'False'
+    assert (b | True).expression.to_sql(dialect) == 'True'
+    assert (b ^ True).expression.to_sql(dialect) == (~b).expression.to_sql(dialect)
+    assert (~~b).expression == b.expression
+    assert (~~(b & df['c'])).expression == (b & df['c']).expression
+    not_b = ~b
+    assert (~not_b.copy_override(expression=deepcopy(not_b.expression))).expression == b.expression
+    assert (b & False).name == 'b'
+
+
+def test_boolean_operator_constant_folding_aggregated(dialect):
+    df = get_fake_df(
+        dialect=dialect, index_names=['a'], data_names=['b', 'c'],
+        dtype={'a': 'int64', 'b': 'bool', 'c': 'bool'}
+    )
+    b_name = quote_identifier(dialect, 'b')
+
+    # An aggregated series cannot be replaced by a constant, as it would lose its aggregation function
+    grouped = df.groupby('a').b.max()
+    assert (grouped & True) is grouped
+    assert (grouped | False) is grouped
+    assert (grouped & False).expression.to_sql(dialect) == f'(bool_or({b_name})) AND (False)'
+    assert (grouped | True).expression.to_sql(dialect) == f'(bool_or({b_name})) OR (True)'
+    # generating sql should not raise an error about unaggregated series
+    (grouped & False).to_frame().view_sql()
+    (grouped | True).to_frame().view_sql()
+
+    windowed = df.b.window_first_value(df.sort_values('c').window())
+    windowed_sql = windowed.expression.to_sql(dialect)
+    assert (windowed & True) is windowed
+    assert (windowed & False).expression.to_sql(dialect) == f'({windowed_sql}) AND (False)'
+    assert (windowed | True).expression.to_sql(dialect) == f'({windowed_sql}) OR (True)'
+
+
+def test_boolean_operator_flattening(dialect):
+    df = get_fake_df(
+        dialect=dialect, index_names=['i'], data_names=['a', 'b', 'c'],
+        dtype={'i': 'int64', 'a': 'bool', 'b': 'bool', 'c': 'bool'}
+    )
+    a, b, c = df['a'], df['b'], df['c']
+    a_sql, b_sql, c_sql = (quote_identifier(dialect, name) for name in ('a', 'b', 'c'))
+
+    expected = f'({a_sql}) AND ({b_sql}) AND ({c_sql})'
+    assert ((a & b) & c).expression.to_sql(dialect) == expected
+    assert (a & (b & c)).expression.to_sql(dialect) == expected
+    # the flattened expression is the same as when it's constructed directly
+    assert (a & (b & c)).expression == NonAtomicExpression.construct('({}) AND ({}) AND ({})', a, b, c)
+    # also if the tokens are not shared with the ones of the format string, e.g. after copying
+    a_and_b = a & b
+    a_and_b = a_and_b.copy_override(expression=deepcopy(a_and_b.expression))
+    assert (a_and_b & c).expression.to_sql(dialect) == expected
+    assert ((a | b) | (c | a)).expression.to_sql(dialect) == \
+        f'({a_sql}) OR ({b_sql}) OR ({c_sql}) OR ({a_sql})'
+
+    # different operators are not flattened
+    assert ((a | b) & c).expression.to_sql(dialect) == f'((({a_sql}) OR ({b_sql}))) AND ({c_sql})'
+    assert ((a ^ b) ^ c).expression.to_sql(dialect) == f'((({a_sql}) != ({b_sql}))) != ({c_sql})'
+    assert (~(a & b) & c).expression.to_sql(dialect) == f'(NOT ((({a_sql}) AND ({b_sql})))) AND ({c_sql})'
@@ -3,7 +3,8 @@ Copyright 2022 Objectiv B.V.
 """
 import pytest
 
-from tests.unit.bach.util import get_fake_df_test_data
+from sql_models.util import is_bigquery
+from tests.unit.bach.util import get_fake_df_test_data, get_fake_df
 
 
 def test_dataframe_agg_dd_parameter(dialect):
@@ -33,3 +34,16 @@ def test_dataframe_agg_skipna_parameter(dialect):
         with pytest.raises(AttributeError):
             # methods not present at all, so needs to raise
             bt.agg(agg, skipna=False)
+
+
+def test_mod(dialect):
+    df = get_fake_df(dialect, ['i'], ['a', 'b'], dtype={'i': 'int64', 'a': 'int64', 'b': 'float64'})
+    result = df.a % df.b
+    assert result.dtype == 'float64'
+    if is_bigquery(dialect):
+        assert result.expression.to_sql(dialect) == '`a` - floor(`a` / `b`) * `b`'
+    else:
+        assert result.expression.to_sql(dialect) == '"a" - floor("a" / "b") * "b"'
+
+    result = df.a % 3
+    assert result.dtype == 'int64'
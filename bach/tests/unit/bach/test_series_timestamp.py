@@ -19,6 +19,7 @@ def test_supported_value_to_literal(dialect):
     assert_call(datetime.datetime(1999, 1, 15, 13, 37, 1, 23), '1999-01-15 13:37:01.000023')
     assert_call(datetime.datetime(1969, 12, 31, 1, 2, 3, 00),  '1969-12-31 01:02:03.000000')
     assert_call(datetime.datetime(2050, 7, 7, 7, 7, 7, 7),     '2050-07-07 07:07:07.000007')
+    assert_call(datetime.datetime(999, 1, 2),                  '999-01-02 00:00:00.000000')
 
     # TODO: datetime with timezone set
 
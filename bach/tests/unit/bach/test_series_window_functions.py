@@ -113,9 +113,16 @@ def test_window_lead(dialect):
 
     result_sql = result.expression.to_sql(dialect)
     column_name = '`b`' if is_bigquery(dialect) else '"b"'
-    value = 'NULL' if is_bigquery(dialect) else 'cast(NULL as bigint)'
     assert result_sql == (
-        f'lead({column_name}, 1, {value}) over '
+        f'lead({column_name}, 1) over '
+        f'( order by {column_name} desc RANGE BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)'
+    )
+
+    result = series_b.window_lag(2, 9999, window=w)
+    result_sql = result.expression.to_sql(dialect)
+    value = '9999' if is_bigquery(dialect) else 'cast(9999 as bigint)'
+    assert result_sql == (
+        f'lag({column_name}, 2, {value}) over '
         f'( order by {column_name} desc RANGE BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)'
     )
 
@@ -163,3 +170,17 @@ def test_window_nth_value(dialect):
         f'nth_value({column_name}, 10) over '
         f'( order by {column_name} desc RANGE BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)'
     )
+
+
+def test_window_without_frame_clause(dialect):
+    left = get_fake_df(dialect, ['a'], ['b', 'c'])
+    w = left.sort_values(by='b', ascending=True).window().group_by
+    assert w.frame_clause == 'RANGE BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW'
+
+    without = w.without_frame_clause()
+    assert without.frame_clause == ''
+    assert without == w
+    assert without.order_by == w.order_by
+    # the clone is only created once, and a window without frame clause is returned as-is
+    assert w.without_frame_clause() is without
+    assert without.without_frame_clause() is without
@@ -3,8 +3,9 @@ Copyright 2022 Objectiv B.V.
 """
 import pytest
 
-from bach import Series
-from bach.types import TypeRegistry, get_series_type_from_dtype, value_to_dtype, register_dtype
+from bach import Series, SeriesString
+from bach.types import TypeRegistry, get_series_type_from_dtype, value_to_dtype, register_dtype, \
+    value_to_series_type
 from sql_models.constants import DBDialect
 
 
@@ -52,3 +53,22 @@ def test_custom_type_register(monkeypatch):
     assert value_to_dtype('a string') == 'test_type'
     assert value_to_dtype(123) == 'test_type'
     assert value_to_dtype(123.45) == 'float64'
+
+
+@pytest.mark.db_independent
+def test_custom_type_register_value_type_after_use(monkeypatch):
+    monkeypatch.setattr('bach.types._registry', TypeRegistry())
+    # lookup the dtype of a string value before registering a new default type for strings
+    assert value_to_dtype('a string') == 'string'
+    assert value_to_series_type('a string') is SeriesString
+
+    @register_dtype([str], override_registered_types=True)
+    class TestStringType(Series):
+        """ Test class for custom types. """
+        dtype = 'test_type'
+        supported_db_dtype = {DBDialect.POSTGRES: 'test_type'}
+        supported_value_types = (str, )
+
+    assert value_to_dtype('a string') == 'test_type'
+    assert value_to_dtype(123) == 'int64'
+    assert value_to_series_type('a string') is TestStringType
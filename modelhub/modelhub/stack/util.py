@@ -1,6 +1,8 @@
 """
 Copyright 2021 Objectiv B.V.
 """
+from functools import lru_cache
+
 from modelhub.stack.basic_features import BasicFeatures
 from modelhub.stack.extracted_contexts import ExtractedContexts
 from modelhub.stack.sessionized_data import SessionizedData
@@ -8,19 +10,19 @@ from modelhub.stack.sessionized_data import SessionizedData
 from sql_models.model import SqlModel
 
 
+# Date range filters, by whether start_date and end_date are set
+_DATE_RANGE_TEMPLATES = {
+    (True, True): "where day between '{start_date}' and '{end_date}'",
+    (True, False): "where day >= '{start_date}'",
+    (False, True): "where day <= '{end_date}'",
+    (False, False): '',
+}
+
+
+@lru_cache(maxsize=128)
 def _get_date_range(start_date, end_date):
-    if start_date:
-        if end_date:
-            date_range = f"where day between '{start_date}' and '{end_date}'"
-        else:
-            date_range = f"where day >= '{start_date}'"
-    else:
-        if end_date:
-            date_range = f"where day <= '{end_date}'"
-        else:
-            date_range = ''
-
-    return date_range
+    template = _DATE_RANGE_TEMPLATES[(bool(start_date), bool(end_date))]
+    return template.format(start_date=start_date, end_date=end_date)
 
 
 def basic_feature_model(session_gap_seconds=1800,